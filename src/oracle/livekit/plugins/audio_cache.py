@@ -7,12 +7,61 @@ Date: 2025-08-12
 
 import os
 
-import json
+import sqlite3
 
-from livekit.agents import utils
+import hashlib
 
+import zlib
 
-INDEX_FILE_NAME = "index.json"
+import math
+
+import time
+
+import atexit
+
+import threading
+
+import weakref
+
+from collections import OrderedDict
+
+from .buffer_pool import pcm_buffer_pool
+
+
+INDEX_FILE_NAME = "index.sqlite"
+
+FLUSH_EVERY_N_MUTATIONS = 32
+
+MEMORY_CACHE_MAXIMUM_ENTRIES = 64
+
+NUMBER_OF_MEMORY_CACHE_SHARDS = 16
+
+DISK_CACHE_MAXIMUM_ENTRIES = 4096
+
+CODEC_PCM16 = "pcm16"
+
+CODEC_ZLIB = "zlib"
+
+#
+#  eviction considers only the least recently used tenth of the index, then picks the entry
+#  whose value score (size, synthesis cost, and hit rate) is lowest within that tenth.
+#
+EVICTION_CANDIDATE_FRACTION = 0.10
+
+#
+#  one module-level atexit hook flushes every live cache. registering a bound method per
+#  instance would hold a strong reference to it forever, which would defeat the weak instance
+#  registry below and stack one registration per cache directory ever opened.
+#
+_live_caches = weakref.WeakSet()
+
+
+def _flush_live_indexes():
+    for audio_cache in list(_live_caches):
+        audio_cache._flush_index()
+
+
+atexit.register(_flush_live_indexes)
 
 
 class AudioCache:
@@ -20,20 +69,94 @@ class AudioCache:
     The audio cache class.
     """
 
-    def __init__(self, *, audio_cache_file_path: str):
+    #
+    #  one cache instance per path, shared process-wide. the weak dictionary lets an instance
+    #  be collected once the last TTS plug-in referencing it goes away.
+    #
+    _instances = weakref.WeakValueDictionary()
+    _instances_lock = threading.Lock()
+
+
+    @classmethod
+    def get_or_create(cls, *, audio_cache_file_path: str, codec: str = CODEC_PCM16):
+        """
+        Get the process-wide audio cache for the specified path, creating it on first use.
+        Multiple TTS plug-in instances pointed at the same path share one cache (one SQLite
+        connection, one in-memory hot layer) instead of opening duplicate state. The codec
+        applies to newly written entries; if the cache already exists its codec is kept, and
+        mixed entries read back correctly since each entry records its own codec.
+
+        Parameters:
+        audio_cache_file_path (str): The audio cache file path.
+        codec (str): The storage codec for new entries (CODEC_PCM16 or CODEC_ZLIB).
+
+        Returns:
+        AudioCache: The audio cache.
+        """
+
+        normalized_path = os.path.abspath(os.path.expanduser(audio_cache_file_path))
+
+        with cls._instances_lock:
+            audio_cache = cls._instances.get(normalized_path)
+            if audio_cache is None:
+                audio_cache = cls(audio_cache_file_path = normalized_path, codec = codec)
+                cls._instances[normalized_path] = audio_cache
+            return audio_cache
+
+
+    def __init__(self, *, audio_cache_file_path: str, codec: str = CODEC_PCM16):
         self._audio_cache_file_path = audio_cache_file_path
 
-        if not os.path.exists(self._audio_cache_file_path):
-            os.makedirs(self._audio_cache_file_path)
+        self._codec = codec
+
+        os.makedirs(self._audio_cache_file_path, exist_ok = True)
 
         self._index_file_spec = os.path.join(self._audio_cache_file_path, INDEX_FILE_NAME)
 
-        if os.path.exists(self._index_file_spec):
-            with open(self._index_file_spec, 'r', encoding='utf-8') as file:
-                index_json_text = file.read()
-            self._index_dictionary = json.loads(index_json_text)            
-        else:
-            self._index_dictionary = {}
+        #
+        #  cache calls are made from worker threads (asyncio.to_thread) as well as the event
+        #  loop thread, so the connection is shared across threads and guarded by a lock.
+        #
+        self._connection = sqlite3.connect(self._index_file_spec, check_same_thread = False)
+        self._index_lock = threading.Lock()
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("PRAGMA cache_size=-65536")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries("
+            "key TEXT PRIMARY KEY, "
+            "size INTEGER DEFAULT 0, "
+            "hit_count INTEGER DEFAULT 0, "
+            "last_access_ns INTEGER DEFAULT 0, "
+            "synthesis_milliseconds REAL DEFAULT 0, "
+            "codec TEXT DEFAULT 'pcm16')"
+            )
+        #
+        #  indexes created before the bookkeeping columns existed are migrated in place.
+        #
+        for column_definition in (
+            "size INTEGER DEFAULT 0",
+            "hit_count INTEGER DEFAULT 0",
+            "last_access_ns INTEGER DEFAULT 0",
+            "synthesis_milliseconds REAL DEFAULT 0",
+            "codec TEXT DEFAULT 'pcm16'"
+            ):
+            try:
+                self._connection.execute("ALTER TABLE entries ADD COLUMN " + column_definition)
+            except sqlite3.OperationalError:
+                pass
+        self._connection.commit()
+
+        self._pending_mutations = 0
+
+        #
+        #  the in-memory hot layer is sharded by key hash with a lock per shard, so concurrent
+        #  lookups for different keys do not contend on a single mutex.
+        #
+        self._memory_cache_shards = [OrderedDict() for _ in range(NUMBER_OF_MEMORY_CACHE_SHARDS)]
+        self._memory_cache_locks = [threading.Lock() for _ in range(NUMBER_OF_MEMORY_CACHE_SHARDS)]
+
+        _live_caches.add(self)
 
 
     def get_audio_bytes(
@@ -66,27 +189,84 @@ class AudioCache:
             audio_channels = audio_channels,
             audio_bits = audio_bits
             )
-        
-        if key in self._index_dictionary:
-            dictionary = self._index_dictionary[key]
-            audio_bytes_file_name = dictionary["audio_bytes_file_name"]
-            audio_bytes_file_spec = os.path.join(self._audio_cache_file_path, audio_bytes_file_name)
-            if os.path.exists(audio_bytes_file_spec):
-                write_index_dictionary = False
-                with open(audio_bytes_file_spec, 'rb') as file:
-                    audio_bytes = file.read()
-            else:
-                del self._index_dictionary[key]
-                write_index_dictionary = True
+
+        return self.get_by_key(key)
+
+
+    def get_by_key(self, key: str):
+        """
+        Get the audio bytes for the specified precomputed key. Callers that need both the get
+        and the set for one utterance can form the key once with form_key and avoid hashing
+        the text twice.
+
+        Parameters:
+        key (str): The key, as returned by form_key.
+
+        Returns:
+        bytes: The audio bytes.
+        """
+
+        shard_index = hash(key) & (NUMBER_OF_MEMORY_CACHE_SHARDS - 1)
+        shard = self._memory_cache_shards[shard_index]
+        with self._memory_cache_locks[shard_index]:
+            if key in shard:
+                shard.move_to_end(key)
+                return shard[key]
+
+        with self._index_lock:
+            row = self._connection.execute("SELECT codec FROM entries WHERE key=?", (key,)).fetchone()
+
+            if row is not None:
+                #
+                #  hit bookkeeping feeds the value-aware eviction; memory-cache hits above do
+                #  not pay for it since entries served from memory are recent by definition.
+                #
+                self._connection.execute(
+                    "UPDATE entries SET hit_count = hit_count + 1, last_access_ns = ? WHERE key=?",
+                    (time.time_ns(), key)
+                    )
+                self._note_mutation()
+
+        if row is not None:
+            #
+            #  the key is a fixed-size digest so it doubles as the on-disk file name.
+            #
+            audio_bytes_file_spec = os.path.join(self._audio_cache_file_path, key)
+            try:
+                #
+                #  buffering=0 plus readinto reads the blob straight into a pooled buffer with
+                #  no intermediate copy. the returned memoryview belongs to the caller, who may
+                #  hand it back through buffer_pool.pcm_buffer_pool.release once the audio has
+                #  been consumed; because its lifetime is the caller's, it is not promoted into
+                #  the in-memory cache (which is fed immutable bytes by the set path).
+                #
+                with open(audio_bytes_file_spec, 'rb', buffering = 0) as file:
+                    number_of_bytes = os.fstat(file.fileno()).st_size
+                    buffer = pcm_buffer_pool.acquire(number_of_bytes)
+                    view = memoryview(buffer)
+                    offset = 0
+                    while offset < number_of_bytes:
+                        count = file.readinto(view[offset:number_of_bytes])
+                        if count == 0:
+                            break
+                        offset += count
+                if row[0] == CODEC_ZLIB:
+                    #
+                    #  decompression produces its own bytes, so the pooled read buffer can go
+                    #  straight back to the pool.
+                    #
+                    audio_bytes = zlib.decompress(view[:offset])
+                    pcm_buffer_pool.release(view)
+                else:
+                    audio_bytes = view[:offset]
+            except FileNotFoundError:
+                with self._index_lock:
+                    self._connection.execute("DELETE FROM entries WHERE key=?", (key,))
+                    self._note_mutation()
                 audio_bytes = None
         else:
-            write_index_dictionary = False
             audio_bytes = None
 
-        if write_index_dictionary:
-            with open(self._index_file_spec, 'w', encoding='utf-8') as file:
-                json.dump(self._index_dictionary, file, indent = 4)
-
         return audio_bytes
 
 
@@ -98,7 +278,8 @@ class AudioCache:
         audio_rate: int,
         audio_channels: int,
         audio_bits: int,
-        audio_bytes: bytes
+        audio_bytes: bytes,
+        synthesis_milliseconds: float = 0.0
         ):
         """
         Set the audio bytes for the specified text, voice, audio rate, audio channels, audio bits, and audio bytes.
@@ -110,6 +291,7 @@ class AudioCache:
         audio_channels (int): The audio channels (1 for example).
         audio_bits (int): The audio bits (16 for example).
         audio_bytes (bytes) : The audio bytes.
+        synthesis_milliseconds (float): How long the audio took to synthesize, used by eviction to value the entry.
 
         Returns:
         (nothing)
@@ -122,26 +304,338 @@ class AudioCache:
             audio_channels = audio_channels,
             audio_bits = audio_bits
             )
-        
-        if key in self._index_dictionary:
-            dictionary = self._index_dictionary[key]
-            audio_bytes_file_name = dictionary["audio_bytes_file_name"]
-            write_index_dictionary = False
-        else:
-            audio_bytes_file_name = str(utils.shortuuid())
-            dictionary = {}
-            dictionary["audio_bytes_file_name"] = audio_bytes_file_name
-            self._index_dictionary[key] = dictionary
-            write_index_dictionary = True
 
-        audio_bytes_file_spec = os.path.join(self._audio_cache_file_path, audio_bytes_file_name)
+        self.set_by_key(key, audio_bytes = audio_bytes, synthesis_milliseconds = synthesis_milliseconds)
+
+
+    def set_by_key(self, key: str, *, audio_bytes, synthesis_milliseconds: float = 0.0):
+        """
+        Set the audio bytes for the specified precomputed key.
+
+        Parameters:
+        key (str): The key, as returned by form_key.
+        audio_bytes (bytes | list | tuple): The audio bytes, or a list/tuple of audio chunks.
+        synthesis_milliseconds (float): How long the audio took to synthesize, used by eviction to value the entry.
+
+        Returns:
+        (nothing)
+        """
+
+        chunked = isinstance(audio_bytes, (list, tuple))
+
+        memory_cache_bytes = None if chunked else audio_bytes
+
+        if self._codec == CODEC_ZLIB:
+            #
+            #  speech PCM compresses a few-fold even at the fastest level; the hot layers keep
+            #  the raw PCM so only disk reads pay the (roughly millisecond) decompress.
+            #
+            audio_bytes = zlib.compress(b"".join(audio_bytes) if chunked else bytes(audio_bytes), 1)
+            chunked = False
+
+        payload_size = sum(len(chunk) for chunk in audio_bytes) if chunked else len(audio_bytes)
+
+        with self._index_lock:
+            row = self._connection.execute("SELECT key FROM entries WHERE key=?", (key,)).fetchone()
+
+            if row is None:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO entries(key, size, hit_count, last_access_ns, synthesis_milliseconds, codec) VALUES(?, ?, 0, ?, ?, ?)",
+                    (key, payload_size, time.time_ns(), synthesis_milliseconds, self._codec)
+                    )
+                self._note_mutation()
+                self._evict_if_over_capacity()
+
+        audio_bytes_file_spec = os.path.join(self._audio_cache_file_path, key)
+
+        #
+        #  os.writev writes the whole payload in one syscall and, when the producer hands over a
+        #  list of chunks (streaming TTS), the chunks are written as-is without being joined into
+        #  one buffer first.
+        #
+        buffers = audio_bytes if chunked else [audio_bytes]
+
+        fd = os.open(audio_bytes_file_spec, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.writev(fd, buffers)
+        finally:
+            os.close(fd)
+
+        #
+        #  chunked payloads are not joined for the in-memory cache either; they get promoted on
+        #  their first read instead. the memory cache always holds raw PCM, never the
+        #  compressed form.
+        #
+        if memory_cache_bytes is not None:
+            self._set_memory_cache(key, memory_cache_bytes)
+
+
+    def set_audio_bytes_bulk(self, *, items):
+        """
+        Set many audio entries at once, for example when pre-warming the cache with common
+        phrases. All index inserts happen in a single transaction with a single commit.
+
+        Parameters:
+        items (iterable): An iterable of (text, voice, audio_rate, audio_channels, audio_bits, audio_bytes) tuples.
+
+        Returns:
+        (nothing)
+        """
+
+        keys = []
+
+        for text, voice, audio_rate, audio_channels, audio_bits, audio_bytes in items:
+            key = AudioCache.form_key(
+                text = text,
+                voice = voice,
+                audio_rate = audio_rate,
+                audio_channels = audio_channels,
+                audio_bits = audio_bits
+                )
+
+            audio_bytes_file_spec = os.path.join(self._audio_cache_file_path, key)
+
+            fd = os.open(audio_bytes_file_spec, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.writev(fd, [audio_bytes])
+            finally:
+                os.close(fd)
+
+            self._set_memory_cache(key, audio_bytes)
+
+            keys.append((key, len(audio_bytes), time.time_ns()))
+
+        with self._index_lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO entries(key, size, hit_count, last_access_ns, synthesis_milliseconds) VALUES(?, ?, 0, ?, 0)",
+                keys
+                )
+            self._connection.commit()
+            self._pending_mutations = 0
+
+
+    def form_temporary_file_spec(self, key: str):
+        """
+        Form a unique temporary file spec inside the cache directory for the specified key.
+        Being on the same filesystem as the cache, the finished file can be adopted with an
+        atomic rename.
+
+        Parameters:
+        key (str): The key, as returned by form_key.
+
+        Returns:
+        str: The temporary file spec.
+        """
+
+        return os.path.join(self._audio_cache_file_path, f"{key}.tmp-{os.getpid()}-{threading.get_ident()}-{time.monotonic_ns()}")
+
+
+    def adopt_audio_file(
+        self,
+        key: str,
+        temporary_file_spec: str,
+        *,
+        number_of_bytes: int,
+        synthesis_milliseconds: float = 0.0
+        ):
+        """
+        Adopt an already-written audio file as the entry for the specified key, renaming it
+        into place atomically. This lets a producer stream audio to disk as it is generated
+        instead of holding the whole utterance in memory for a later set call. The entry is
+        stored as raw PCM regardless of the cache codec; each entry records its own codec.
+
+        Parameters:
+        key (str): The key, as returned by form_key.
+        temporary_file_spec (str): The temporary file holding the audio, from form_temporary_file_spec.
+        number_of_bytes (int): The number of audio bytes in the file.
+        synthesis_milliseconds (float): How long the audio took to synthesize, used by eviction to value the entry.
+
+        Returns:
+        (nothing)
+        """
+
+        os.replace(temporary_file_spec, os.path.join(self._audio_cache_file_path, key))
+
+        with self._index_lock:
+            row = self._connection.execute("SELECT key FROM entries WHERE key=?", (key,)).fetchone()
+
+            if row is None:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO entries(key, size, hit_count, last_access_ns, synthesis_milliseconds, codec) VALUES(?, ?, 0, ?, ?, ?)",
+                    (key, number_of_bytes, time.time_ns(), synthesis_milliseconds, CODEC_PCM16)
+                    )
+                self._note_mutation()
+                self._evict_if_over_capacity()
+
+
+    def set_audio_stream(
+        self,
+        *,
+        text: str,
+        voice: str,
+        audio_rate: int,
+        audio_channels: int,
+        audio_bits: int,
+        audio_file_descriptor: int,
+        number_of_bytes: int
+        ):
+        """
+        Set the audio for the specified text, voice, audio rate, audio channels, and audio bits by
+        streaming it from an open file descriptor, without materializing the bytes in memory.
+
+        Parameters:
+        text (str): The text.
+        voice (str): The voice.
+        audio_rate (int): The audio rate (16000 for example).
+        audio_channels (int): The audio channels (1 for example).
+        audio_bits (int): The audio bits (16 for example).
+        audio_file_descriptor (int): The file descriptor to read the audio bytes from.
+        number_of_bytes (int): The number of audio bytes to read.
+
+        Returns:
+        (nothing)
+        """
+
+        key = AudioCache.form_key(
+            text = text,
+            voice = voice,
+            audio_rate = audio_rate,
+            audio_channels = audio_channels,
+            audio_bits = audio_bits
+            )
+
+        with self._index_lock:
+            row = self._connection.execute("SELECT key FROM entries WHERE key=?", (key,)).fetchone()
+
+            if row is None:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO entries(key, size, hit_count, last_access_ns, synthesis_milliseconds) VALUES(?, ?, 0, ?, 0)",
+                    (key, number_of_bytes, time.time_ns())
+                    )
+                self._note_mutation()
+                self._evict_if_over_capacity()
+
+        audio_bytes_file_spec = os.path.join(self._audio_cache_file_path, key)
+
+        #
+        #  os.sendfile copies kernel-to-kernel, so the audio never passes through a Python
+        #  buffer. the entry is promoted into the in-memory cache on its first read instead.
+        #
+        fd = os.open(audio_bytes_file_spec, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            offset = 0
+            while offset < number_of_bytes:
+                count = os.sendfile(fd, audio_file_descriptor, offset, number_of_bytes - offset)
+                if count == 0:
+                    break
+                offset += count
+        finally:
+            os.close(fd)
+
+
+    def _evict_if_over_capacity(self):
+        """
+        Evict one entry if the index has grown past its capacity. Plain LRU would let a burst
+        of one-off phrases push out frequently re-requested greetings, so eviction is value
+        aware: the candidates are the least recently used tenth of the index, and the one with
+        the lowest combination of size-per-synthesis-cost and hit rate is removed. The caller
+        must hold the index lock.
+
+        Returns:
+        (nothing)
+        """
+
+        count = self._connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+        if count <= DISK_CACHE_MAXIMUM_ENTRIES:
+            return
+
+        number_of_candidates = max(1, int(count * EVICTION_CANDIDATE_FRACTION))
+
+        candidates = self._connection.execute(
+            "SELECT key, size, hit_count, last_access_ns, synthesis_milliseconds FROM entries ORDER BY last_access_ns ASC LIMIT ?",
+            (number_of_candidates,)
+            ).fetchall()
 
-        with open(audio_bytes_file_spec, 'wb') as file:
-            file.write(audio_bytes)
+        now = time.time_ns()
+
+        eviction_key = None
+        eviction_score = None
+
+        for key, size, hit_count, last_access_ns, synthesis_milliseconds in candidates:
+            age_seconds = max((now - last_access_ns) / 1e9, 1e-3)
+            synthesis_milliseconds = max(synthesis_milliseconds, 1e-3)
+
+            score = math.log(size / synthesis_milliseconds + hit_count / age_seconds + 1e-6)
+
+            if eviction_score is None or score < eviction_score:
+                eviction_key = key
+                eviction_score = score
+
+        self._connection.execute("DELETE FROM entries WHERE key=?", (eviction_key,))
+        self._note_mutation()
+
+        try:
+            os.unlink(os.path.join(self._audio_cache_file_path, eviction_key))
+        except FileNotFoundError:
+            pass
+
+
+    def _set_memory_cache(self, key, audio_bytes):
+        """
+        Set the audio bytes into the in-memory cache, evicting the least recently used entry if full.
+
+        Parameters:
+        key (str): The key.
+        audio_bytes (bytes): The audio bytes.
+
+        Returns:
+        (nothing)
+        """
+
+        shard_index = hash(key) & (NUMBER_OF_MEMORY_CACHE_SHARDS - 1)
+        shard = self._memory_cache_shards[shard_index]
+        with self._memory_cache_locks[shard_index]:
+            #
+            #  the stored object is returned to every future hit, so it must be an immutable
+            #  bytes copy: storing a caller's memoryview would let the caller (or the buffer
+            #  pool) invalidate the cached entry under us. bytes() is a no-op for bytes input.
+            #
+            shard[key] = bytes(audio_bytes)
+            shard.move_to_end(key)
+
+            while len(shard) > MEMORY_CACHE_MAXIMUM_ENTRIES // NUMBER_OF_MEMORY_CACHE_SHARDS:
+                shard.popitem(last = False)
+
+
+    def _note_mutation(self):
+        """
+        Note one index mutation, committing the open transaction once enough mutations have
+        accumulated. The caller must hold the index lock.
+
+        Returns:
+        (nothing)
+        """
+
+        self._pending_mutations += 1
+
+        if self._pending_mutations >= FLUSH_EVERY_N_MUTATIONS:
+            self._connection.commit()
+            self._pending_mutations = 0
+
+
+    def _flush_index(self):
+        """
+        Flush any pending index mutations to disk.
+
+        Returns:
+        (nothing)
+        """
 
-        if write_index_dictionary:
-            with open(self._index_file_spec, 'w', encoding='utf-8') as file:
-                json.dump(self._index_dictionary, file, indent = 4)
+        with self._index_lock:
+            if self._pending_mutations > 0:
+                self._connection.commit()
+                self._pending_mutations = 0
 
 
     @staticmethod
@@ -167,5 +661,8 @@ class AudioCache:
         (nothing)
         """
 
-        key = voice + "\t" + str(audio_rate) + "\t" + str(audio_channels) + "\t" + str(audio_bits) + "\t" + text
+        key = hashlib.blake2b(
+            f"{voice}\t{audio_rate}\t{audio_channels}\t{audio_bits}\t{text}".encode("utf-8"),
+            digest_size = 16
+            ).hexdigest()
         return key
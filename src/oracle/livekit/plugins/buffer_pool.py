@@ -0,0 +1,111 @@
+"""
+This module implements a size-bucketed buffer pool for PCM audio. Reusing buffers avoids a
+large allocation (and the garbage-collection churn that goes with it) for every utterance the
+TTS plug-in synthesizes or reads back from the audio cache.
+
+Author: Keith Schnable (at Oracle Corporation)
+Date: 2026-09-01
+"""
+
+import threading
+
+from collections import deque
+
+
+MINIMUM_BUCKET_SIZE = 1 << 14
+
+MAXIMUM_BUCKET_SIZE = 1 << 20
+
+MAXIMUM_BUFFERS_PER_BUCKET = 8
+
+
+class BucketPool:
+    """
+    The bucket pool class. Buffers are grouped into power-of-two size buckets; acquire returns
+    a buffer from the smallest bucket that fits, and release returns it for reuse.
+    """
+
+    def __init__(
+        self,
+        *,
+        minimum_bucket_size: int = MINIMUM_BUCKET_SIZE,
+        maximum_bucket_size: int = MAXIMUM_BUCKET_SIZE,
+        maximum_buffers_per_bucket: int = MAXIMUM_BUFFERS_PER_BUCKET
+        ):
+        self._maximum_buffers_per_bucket = maximum_buffers_per_bucket
+
+        self._buckets = {}
+        bucket_size = minimum_bucket_size
+        while bucket_size <= maximum_bucket_size:
+            self._buckets[bucket_size] = deque()
+            bucket_size <<= 1
+
+        self._lock = threading.Lock()
+
+
+    def acquire(self, number_of_bytes: int) -> bytearray:
+        """
+        Acquire a buffer of at least the specified size.
+
+        Parameters:
+        number_of_bytes (int): The minimum buffer size.
+
+        Returns:
+        bytearray: The buffer. Its length is the bucket size, which may exceed number_of_bytes.
+        """
+
+        for bucket_size, bucket in self._buckets.items():
+            if bucket_size >= number_of_bytes:
+                with self._lock:
+                    if len(bucket) > 0:
+                        return bucket.pop()
+                return bytearray(bucket_size)
+
+        #
+        #  larger than the largest bucket; allocate exactly and never pool it.
+        #
+        return bytearray(number_of_bytes)
+
+
+    def release(self, buffer) -> None:
+        """
+        Release a buffer back to the pool. Buffers that did not come from the pool (bytes,
+        memoryviews over bytes, or oversized allocations) are ignored, so callers can release
+        whatever they were handed without checking its origin.
+
+        Parameters:
+        buffer (bytearray | memoryview | bytes): The buffer to release.
+
+        Returns:
+        (nothing)
+        """
+
+        if isinstance(buffer, memoryview):
+            underlying = buffer.obj
+
+            #
+            #  only views over pool-owned bytearrays may be collapsed and recycled. a view
+            #  over anything else (response bytes, an entry stored in a shared cache) must be
+            #  left untouched: releasing it would break every other holder of that object.
+            #
+            if not isinstance(underlying, bytearray) or len(underlying) not in self._buckets:
+                return
+
+            buffer.release()
+            buffer = underlying
+
+        if not isinstance(buffer, bytearray):
+            return
+
+        bucket = self._buckets.get(len(buffer))
+
+        if bucket is not None:
+            with self._lock:
+                if len(bucket) < self._maximum_buffers_per_bucket:
+                    bucket.append(buffer)
+
+
+#
+#  the process-wide pool shared by the audio cache and the TTS plug-in.
+#
+pcm_buffer_pool = BucketPool()
@@ -13,17 +13,17 @@ logger = logging.getLogger(__name__)
 
 from dataclasses import dataclass
 
-from typing import Any, Callable
-
-import copy
+from typing import Any, Callable, ClassVar
 
 import ast
 
 import uuid
 
+import threading
+
 import oci
-from oci.config import from_file
-from oci.auth.signers.security_token_signer import SecurityTokenSigner
+
+from .signer_cache import get_configuration_and_signer
 
 
 BACK_END_GEN_AI_LLM = "llm"
@@ -39,6 +39,14 @@ ROLE_DEVELOPER = "developer"
 TOOL_CALL_PREFIX = "TOOL-CALL:"
 TOOL_CALL_DESCRIPTION = "tool-call"
 
+#
+#  clients are cached per configuration + endpoint so OracleLLM instances share them; the
+#  signers themselves come from the process-wide signer cache shared with the STT and TTS
+#  wrappers.
+#
+_client_cache = {}
+_client_cache_lock = threading.Lock()
+
 
 class OracleLLM():
     """
@@ -101,6 +109,9 @@ class OracleLLM():
 
         self._number_of_runs = 0
 
+        self._tool_descriptions_cache_key = None
+        self._tool_descriptions = None
+
         if self._parameters.back_end == BACK_END_GEN_AI_LLM:
             self.initialize_for_llm()
         else: # if self._parameters.back_end == BACK_END_GEN_AI_AGENT:
@@ -108,37 +119,11 @@ class OracleLLM():
 
 
     def initialize_for_llm(self):
-        config = from_file(self._parameters.authentication_configuration_file_spec, self._parameters.authentication_configuration_name)
-        with open(config["security_token_file"], "r") as f:
-            token = f.readline()
-        private_key = oci.signer.load_private_key_from_file(config["key_file"])
-        signer = SecurityTokenSigner(token = token, private_key = private_key)
-
-        service_endpoint = ("https" if self._parameters.secure else "http") + "://" + self._parameters.host + ":" + str(self._parameters.port_number)
-
-        self._generative_ai_inference_client = oci.generative_ai_inference.GenerativeAiInferenceClient(
-            config = {},
-            service_endpoint = service_endpoint,
-            retry_strategy = oci.retry.NoneRetryStrategy(),
-            signer = signer
-            )
+        self._generative_ai_inference_client = self.get_cached_client(oci.generative_ai_inference.GenerativeAiInferenceClient)
 
 
     def initialize_for_agent(self):
-        config = from_file(self._parameters.authentication_configuration_file_spec, self._parameters.authentication_configuration_name)
-        with open(config["security_token_file"], "r") as f:
-            token = f.readline()
-        private_key = oci.signer.load_private_key_from_file(config["key_file"])
-        signer = SecurityTokenSigner(token = token, private_key = private_key)
-
-        service_endpoint = ("https" if self._parameters.secure else "http") + "://" + self._parameters.host + ":" + str(self._parameters.port_number)
-
-        self._generative_ai_agent_runtime_client = oci.generative_ai_agent_runtime.GenerativeAiAgentRuntimeClient(
-            config = {},
-            service_endpoint = service_endpoint,
-            retry_strategy = oci.retry.NoneRetryStrategy(),
-            signer = signer
-            )
+        self._generative_ai_agent_runtime_client = self.get_cached_client(oci.generative_ai_agent_runtime.GenerativeAiAgentRuntimeClient)
         
         id = str(uuid.uuid4())
         
@@ -154,6 +139,37 @@ class OracleLLM():
         self._session_id = response.data.id
 
 
+    def get_cached_client(self, client_class):
+        service_endpoint = ("https" if self._parameters.secure else "http") + "://" + self._parameters.host + ":" + str(self._parameters.port_number)
+
+        cache_key = (
+            client_class,
+            self._parameters.authentication_configuration_file_spec,
+            self._parameters.authentication_configuration_name,
+            service_endpoint
+            )
+
+        with _client_cache_lock:
+            client = _client_cache.get(cache_key)
+
+            if client is None:
+                config, signer = get_configuration_and_signer(
+                    self._parameters.authentication_configuration_file_spec,
+                    self._parameters.authentication_configuration_name
+                    )
+
+                client = client_class(
+                    config = {},
+                    service_endpoint = service_endpoint,
+                    retry_strategy = oci.retry.NoneRetryStrategy(),
+                    signer = signer
+                    )
+
+                _client_cache[cache_key] = client
+
+        return client
+
+
     #
     #  each role must be one of: ROLE_USER, ROLE_SYSTEM, ROLE_ASSISTANT, or ROLE_DEVELOPER.
     #
@@ -169,90 +185,86 @@ class OracleLLM():
     
 
     def run_for_llm(self, *, oracle_llm_content_list: list[OracleLLMContent] = [], tools: list[OracleTool] = None) -> list[str]:
-        while True:
-            temp_message_list = []
-            temp_messages = ""
-
-            tool_descriptions = OracleLLM.get_tool_descriptions(tools)
-            if tool_descriptions is not None:
-                text_content = oci.generative_ai_inference.models.TextContent()
-                text_content.text = tool_descriptions
-
-                message = oci.generative_ai_inference.models.Message()
-                message.role = ROLE_SYSTEM.upper() # it seems "GENERIC" requires that roles be in uppercase.
-                message.content = [text_content]
-
-                temp_message_list.append(message)
-
-                if len(temp_messages) > 0:
-                    temp_messages += "\n"
-
-                temp_messages += tool_descriptions
-
-            for oracle_llm_content in oracle_llm_content_list:
-                if oracle_llm_content.content_type == CONTENT_TYPE_STRING:
-                    text_content = oci.generative_ai_inference.models.TextContent()
-                    text_content.text = oracle_llm_content.content_data
-
-                    message = oci.generative_ai_inference.models.Message()
-                    message.role = oracle_llm_content.role.upper() # it seems "GENERIC" requires that roles be in uppercase.
-                    message.content = [text_content]
+        tool_descriptions = self.get_cached_tool_descriptions(tools)
+        tool_dictionary = {tool.name: tool for tool in tools} if tools is not None else {}
 
-                    temp_message_list.append(message)
+        #
+        #  bind the parameters to locals so the loop below does one-level lookups instead of
+        #  repeated two-level attribute chains.
+        #
+        parameters = self._parameters
+        model_type = parameters.model_type
 
-                    if len(temp_messages) > 0:
-                        temp_messages += "\n"
+        temp_message_list = []
+        temp_message_texts = []
 
-                    temp_messages += oracle_llm_content.content_data
+        if tool_descriptions is not None:
+            temp_message_list.append(OracleLLM.form_message(tool_descriptions, ROLE_SYSTEM))
+            temp_message_texts.append(tool_descriptions)
 
-            if self._parameters.model_type == "GENERIC":
-                chat_request = oci.generative_ai_inference.models.GenericChatRequest()
-                chat_request.messages = temp_message_list
-
-            elif self._parameters.model_type == "COHERE":
-                chat_request = oci.generative_ai_inference.models.CohereChatRequest()
-                chat_request.message = temp_messages
-
-            if self._parameters.maximum_number_of_tokens is not None:
-                chat_request.max_tokens = self._parameters.maximum_number_of_tokens
-            if self._parameters.temperature is not None:
-                chat_request.temperature = self._parameters.temperature
-            if self._parameters.frequency_penalty is not None:
-                chat_request.frequency_penalty = self._parameters.frequency_penalty
-            if self._parameters.presence_penalty is not None:
-                chat_request.presence_penalty = self._parameters.presence_penalty
-            if self._parameters.top_p is not None:
-                chat_request.top_p = self._parameters.top_p
-            if self._parameters.top_k is not None:
-                chat_request.top_k = self._parameters.top_k
-            if self._parameters.seed is not None:
-                chat_request.seed = self._parameters.seed
+        for oracle_llm_content in oracle_llm_content_list:
+            if oracle_llm_content.content_type == CONTENT_TYPE_STRING:
+                temp_message_list.append(OracleLLM.form_message(oracle_llm_content.content_data, oracle_llm_content.role))
+                temp_message_texts.append(oracle_llm_content.content_data)
+
+        #
+        #  everything but the messages is invariant across tool-call round trips, so the request,
+        #  serving mode, and chat details are built once up front and only the messages are
+        #  appended to inside the loop.
+        #
+        if model_type == "GENERIC":
+            chat_request = oci.generative_ai_inference.models.GenericChatRequest()
+            chat_request.messages = temp_message_list
+
+        elif model_type == "COHERE":
+            chat_request = oci.generative_ai_inference.models.CohereChatRequest()
+
+        if parameters.maximum_number_of_tokens is not None:
+            chat_request.max_tokens = parameters.maximum_number_of_tokens
+        if parameters.temperature is not None:
+            chat_request.temperature = parameters.temperature
+        if parameters.frequency_penalty is not None:
+            chat_request.frequency_penalty = parameters.frequency_penalty
+        if parameters.presence_penalty is not None:
+            chat_request.presence_penalty = parameters.presence_penalty
+        if parameters.top_p is not None:
+            chat_request.top_p = parameters.top_p
+        if parameters.top_k is not None:
+            chat_request.top_k = parameters.top_k
+        if parameters.seed is not None:
+            chat_request.seed = parameters.seed
+
+        serving_mode = oci.generative_ai_inference.models.OnDemandServingMode(
+            model_id = parameters.model_name if parameters.model_id is None else parameters.model_id
+            )
 
-            serving_mode = oci.generative_ai_inference.models.OnDemandServingMode(
-                model_id = self._parameters.model_name if self._parameters.model_id is None else self._parameters.model_id
-                )
+        chat_details = oci.generative_ai_inference.models.ChatDetails()
+        chat_details.serving_mode = serving_mode
+        chat_details.chat_request = chat_request
+        chat_details.compartment_id = parameters.compartment_id
 
-            chat_details = oci.generative_ai_inference.models.ChatDetails()
-            chat_details.serving_mode = serving_mode
-            chat_details.chat_request = chat_request
-            chat_details.compartment_id = self._parameters.compartment_id
+        while True:
+            if model_type == "COHERE":
+                chat_request.message = "\n".join(temp_message_texts)
 
             chat_response = self._generative_ai_inference_client.chat(chat_details)
 
-            if self._parameters.model_type == "GENERIC":
+            if model_type == "GENERIC":
                 response_messages = []
                 for temp_content in chat_response.data.chat_response.choices[0].message.content:
                     response_messages.append(temp_content.text)
-            elif self._parameters.model_type == "COHERE":
+            elif model_type == "COHERE":
                 response_messages = [chat_response.data.chat_response.text]
 
-            oracle_llm_content_list = copy.deepcopy(oracle_llm_content_list)
-
             number_of_calls = 0
 
             for response_message in response_messages:
-                if TOOL_CALL_PREFIX in response_message:
-                    if response_message.find(TOOL_CALL_PREFIX, 1) != -1:
+                #
+                #  a tool call is by contract at the start of the message, so startswith avoids
+                #  scanning the whole message on the common plain-text path.
+                #
+                if response_message.startswith(TOOL_CALL_PREFIX):
+                    if TOOL_CALL_PREFIX in response_message[len(TOOL_CALL_PREFIX):]:
                         raise Exception("Unexpectedly received a response message with an embedded " + TOOL_CALL_DESCRIPTION + ".")
                     number_of_calls += 1
 
@@ -266,36 +278,52 @@ class OracleLLM():
 
             logger.debug(response_message)
 
-            result = OracleLLM.call_tool(tools, response_message)
+            result = OracleLLM.call_tool(tool_dictionary, response_message)
 
             if result is None:
                 break # this occurs if the tool call cannot be handled because the tool-call function is None.
 
-            oracle_llm_content = OracleLLMContent(response_message, "string", ROLE_ASSISTANT)
-            oracle_llm_content_list.append(oracle_llm_content)
+            temp_message_list.append(OracleLLM.form_message(response_message, ROLE_ASSISTANT))
+            temp_message_texts.append(response_message)
 
-            oracle_llm_content = OracleLLMContent("The function result of " + response_message + " is: " + result, "string", ROLE_SYSTEM)
-            oracle_llm_content_list.append(oracle_llm_content)
+            function_result_message = f"The function result of {response_message} is: {result}"
+            temp_message_list.append(OracleLLM.form_message(function_result_message, ROLE_SYSTEM))
+            temp_message_texts.append(function_result_message)
 
         return response_messages
-    
+
+
+    @staticmethod
+    def form_message(text, role):
+        text_content = oci.generative_ai_inference.models.TextContent()
+        text_content.text = text
+
+        message = oci.generative_ai_inference.models.Message()
+        message.role = role.upper() # it seems "GENERIC" requires that roles be in uppercase.
+        message.content = [text_content]
+
+        return message
+
 
     def run_for_agent(self, *, oracle_llm_content_list: list[OracleLLMContent] = [], tools: list[OracleTool] = None) -> list[str]:
-        user_message = ""
+        tool_dictionary = {tool.name: tool for tool in tools} if tools is not None else {}
+
+        user_message_parts = []
 
         if self._number_of_runs == 0:
-            tool_descriptions = OracleLLM.get_tool_descriptions(tools)
+            tool_descriptions = self.get_cached_tool_descriptions(tools)
             if tool_descriptions is not None:
-                if len(user_message) > 0:
-                    user_message += "\n"
-                user_message += tool_descriptions
+                user_message_parts.append(tool_descriptions)
 
-        for oracle_llm_content in reversed(oracle_llm_content_list):
-            if oracle_llm_content.content_type == CONTENT_TYPE_STRING:
-                if len(user_message) > 0:
-                    user_message += "\n"
-                user_message += oracle_llm_content.content_data
-                break # kds - what if there are multiple new messages?  should multiple messages always be combined into one with new line delimiters?
+        #
+        #  only the latest string content is sent. kds - what if there are multiple new messages?
+        #  should multiple messages always be combined into one with new line delimiters?
+        #
+        latest_content = next((content for content in reversed(oracle_llm_content_list) if content.content_type == CONTENT_TYPE_STRING), None)
+        if latest_content is not None:
+            user_message_parts.append(latest_content.content_data)
+
+        user_message = "\n".join(user_message_parts)
 
         while True:
             logger.debug(user_message)
@@ -317,18 +345,18 @@ class OracleLLM():
             
             response_messages = [response_message]
 
-            if TOOL_CALL_PREFIX in response_message:
-                if response_message.find(TOOL_CALL_PREFIX, 1) != -1:
+            if response_message.startswith(TOOL_CALL_PREFIX):
+                if TOOL_CALL_PREFIX in response_message[len(TOOL_CALL_PREFIX):]:
                     raise Exception("Unexpectedly received a response message with an embedded " + TOOL_CALL_DESCRIPTION + ".")
                 
-                result = OracleLLM.call_tool(tools, response_message)
+                result = OracleLLM.call_tool(tool_dictionary, response_message)
 
                 if result is None:
                     break # this occurs if the tool call cannot be handled because the tool-call function is None.
 
                 # kdsstart - adding the response_message on both lines may be unneeded and may confused the llm or the agent.
                 # user_message = response_message + "\nThe function result of " + response_message + " is: " + result
-                user_message = "The function result of " + response_message + " is: " + result
+                user_message = f"The function result of {response_message} is: {result}"
                 # kdsend
 
                 continue
@@ -338,47 +366,45 @@ class OracleLLM():
         return response_messages
 
     
+    def get_cached_tool_descriptions(self, tools):
+        #
+        #  the tool descriptions only depend on the tools, so rebuild them only when a different
+        #  tools list is passed in.
+        #
+        if self._tool_descriptions_cache_key != id(tools):
+            self._tool_descriptions_cache_key = id(tools)
+            self._tool_descriptions = OracleLLM.get_tool_descriptions(tools)
+        return self._tool_descriptions
+
+
     @staticmethod
     def get_tool_descriptions(tools):
         if tools is None or len(tools) == 0:
             return None
         
-        tool_descriptions = "You are an assistant with access to the following functions:\n\n"
-
-        for i in range(len(tools)):
-            tool = tools[i]
+        parts = ["You are an assistant with access to the following functions:\n"]
 
-            tool_descriptions += str(i + 1) + ". The function prototype is: " + tool.name + "("
+        for i, tool in enumerate(tools):
+            parameter_names = ",".join(parameter.name for parameter in tool.parameters)
+            parts.append(str(i + 1) + ". The function prototype is: " + tool.name + "(" + parameter_names + ") and the function description is: " + tool.description)
 
-            for j in range(len(tool.parameters)):
-                parameter = tool.parameters[j]
-                if j > 0:
-                    tool_descriptions += ","
-                tool_descriptions += parameter.name
+        parts.append("\nAlways indicate when you want to call a function by writing: \"" + TOOL_CALL_PREFIX + " function_name(parameters)\"")
+        parts.append("Do not combine function calls and text responses in the same output: either only function calls or only text responses.")
+        parts.append("For any string parameters, be sure to enclose each of them in double quotes.")
 
-            tool_descriptions += ") and the function description is: " + tool.description + "\n"
-
-        tool_descriptions += "\nAlways indicate when you want to call a function by writing: \"" + TOOL_CALL_PREFIX + " function_name(parameters)\"\n"
-        tool_descriptions += "Do not combine function calls and text responses in the same output: either only function calls or only text responses.\n"
-        tool_descriptions += "For any string parameters, be sure to enclose each of them in double quotes."
-
-        return tool_descriptions
+        return "\n".join(parts)
     
 
     @staticmethod
-    def call_tool(tools, tool_call):
+    def call_tool(tool_dictionary, tool_call):
         tool_call = tool_call[len(TOOL_CALL_PREFIX):].strip()
         original_tool_call = tool_call
 
         function_name, parameters = OracleLLM.parse_function_call(tool_call, TOOL_CALL_DESCRIPTION)
 
-        found = False
-        for tool in tools:
-            if tool.name == function_name:
-                found = True
-                break
+        tool = tool_dictionary.get(function_name)
 
-        if not found:
+        if tool is None:
             raise Exception("Unknown function name: " + function_name + " in " + TOOL_CALL_DESCRIPTION + " response message: " + original_tool_call + ".")
 
         if tool.function is None:
@@ -392,6 +418,23 @@ class OracleLLM():
 
     @staticmethod
     def parse_function_call(code_string, description):
+        #
+        #  fast path: tool calls are almost always a simple name followed by a parenthesized
+        #  list of literals, which ast.literal_eval can evaluate without spinning up the full
+        #  parser. anything more complex falls through to ast.parse below.
+        #
+        function_name, separator, argument_text = code_string.partition("(")
+        function_name = function_name.strip()
+
+        if separator and argument_text.endswith(")") and function_name.isidentifier():
+            if argument_text == ")":
+                return function_name, []
+            try:
+                function_parameters = ast.literal_eval("(" + argument_text[:-1] + ",)")
+                return function_name, list(function_parameters)
+            except (ValueError, SyntaxError):
+                pass
+
         expression = ast.parse(code_string, mode = "eval").body
 
         if not isinstance(expression, ast.Call):
@@ -411,6 +454,27 @@ class Parameters:
     The parameters class. This class contains all parameter information for the Oracle LLM class.
     """
 
+    __slots__ = (
+        "secure",
+        "host",
+        "port_number",
+        "back_end",
+        "compartment_id",
+        "authentication_configuration_file_spec",
+        "authentication_configuration_name",
+        "model_type",
+        "model_id",
+        "model_name",
+        "maximum_number_of_tokens",
+        "temperature",
+        "top_p",
+        "top_k",
+        "frequency_penalty",
+        "presence_penalty",
+        "seed",
+        "agent_endpoint_id"
+        )
+
     secure: bool
     host: str
     port_number: int
@@ -434,7 +498,7 @@ class Parameters:
     agent_endpoint_id: str
 
 
-@dataclass
+@dataclass(slots = True)
 class OracleLLMContent:
     """
     The Oracle LLM content class. This class contains all information related to one LLM content item.
@@ -444,8 +508,35 @@ class OracleLLMContent:
     content_type: str
     role: str
 
+    #
+    #  content items are created and discarded in bulk on every turn, so a small free list is
+    #  kept to recycle instances and reduce allocation and garbage-collection churn.
+    #
+    _pool: ClassVar[list] = []
+
+    POOL_MAXIMUM_SIZE: ClassVar[int] = 256
+
+    @classmethod
+    def acquire(cls, content_data: Any, content_type: str, role: str) -> OracleLLMContent:
+        if cls._pool:
+            oracle_llm_content = cls._pool.pop()
+            oracle_llm_content.content_data = content_data
+            oracle_llm_content.content_type = content_type
+            oracle_llm_content.role = role
+            return oracle_llm_content
+        return cls(content_data, content_type, role)
+
+    @classmethod
+    def release_all(cls, oracle_llm_content_list: list) -> None:
+        pool = cls._pool
+        for oracle_llm_content in oracle_llm_content_list:
+            if len(pool) >= cls.POOL_MAXIMUM_SIZE:
+                break
+            oracle_llm_content.content_data = None
+            pool.append(oracle_llm_content)
 
-@dataclass
+
+@dataclass(slots = True)
 class OracleValue:
     """
     The Oracle value class. This class contains all information related to one value.
@@ -455,8 +546,11 @@ class OracleValue:
     description: str
     type: str
 
+    def clone(self) -> OracleValue:
+        return OracleValue(self.name, self.description, self.type)
+
 
-@dataclass
+@dataclass(slots = True)
 class OracleTool:
     """
     The Oracle tool class. This class contains all information related to one tool.
@@ -466,3 +560,10 @@ class OracleTool:
     description: str
     function: Callable[..., Any]
     parameters: list[OracleValue]
+
+    def clone(self) -> OracleTool:
+        #
+        #  a bespoke clone: these are simple containers, and copy.deepcopy pays the generic
+        #  pickle-protocol walk for the same result.
+        #
+        return OracleTool(self.name, self.description, self.function, [parameter.clone() for parameter in self.parameters])
@@ -11,13 +11,30 @@ from livekit.agents import llm, utils
 from livekit.agents.types import DEFAULT_API_CONNECT_OPTIONS, APIConnectOptions
 from livekit.plugins.openai.utils import to_fnc_ctx
 
-import copy
-
 import json
 
+import re
+
+from collections import OrderedDict
+
 from .oracle_llm import OracleLLM, OracleLLMContent, OracleTool, OracleValue, ROLE_SYSTEM, ROLE_ASSISTANT, CONTENT_TYPE_STRING, TOOL_CALL_PREFIX, TOOL_CALL_DESCRIPTION, BACK_END_GEN_AI_LLM
 
 
+#
+#  past tool calls older than the conversation window are already serialized into the chat
+#  context, so the call-id dictionary only needs to cover recent calls.
+#
+CALL_ID_DICTIONARY_MAXIMUM_ENTRIES = 2048
+
+#
+#  responses are emitted one sentence at a time so downstream TTS can start synthesizing on
+#  the first sentence instead of waiting for the whole response. the zero-width split keeps
+#  the inter-sentence whitespace (on the following sentence), so the deltas concatenate back
+#  to the exact original text in the persisted chat context.
+#
+SENTENCE_BOUNDARY_PATTERN = re.compile(r"(?<=[.!?])(?=\s)")
+
+
 class LLM(llm.LLM):
     """
     The Oracle LiveKit LLM plug-in class. This derives from livekit.agents.llm.LLM.
@@ -86,11 +103,41 @@ class LLM(llm.LLM):
         self.additional_tools = additional_tools
 
         #
-        #  currently this is never cleaned up because it appears that the past tool calls may
-        #  always be needed to construct the entire conversation history. if this is not actually
-        #  the case, theoretically old keys that are no longer referenced should be removed.
+        #  the additional tools are cloned once here rather than per stream, and mcp tool
+        #  conversions are memoized by the identity of the tools list passed to chat(), since
+        #  both are typically stable for the life of a session.
+        #
+        if additional_tools is None:
+            self._additional_tools_converted = []
+        else:
+            self._additional_tools_converted = [additional_tool.clone() for additional_tool in additional_tools]
+
+        self._mcp_tools_cache = {}
+
         #
-        self._call_id_to_tool_call_dictionary = {}
+        #  bounded so a long-running session cannot grow this without limit: once a tool call
+        #  ages past the conversation window it is already part of the serialized chat context,
+        #  so evicting the oldest entries is safe.
+        #
+        self._call_id_to_tool_call_dictionary = OrderedDict()
+
+
+    def convert_tools(self, livekit_mcp_tools):
+        if livekit_mcp_tools is None:
+            mcp_tools = []
+        else:
+            cache_key = id(livekit_mcp_tools)
+            mcp_tools = self._mcp_tools_cache.get(cache_key)
+            if mcp_tools is None:
+                mcp_tools = DerivedLLMStream.convert_mcp_tools(livekit_mcp_tools)
+                self._mcp_tools_cache[cache_key] = mcp_tools
+
+        tools = self._additional_tools_converted + mcp_tools
+
+        if len(tools) == 0:
+            return None
+
+        return tools
 
 
     def chat(
@@ -122,7 +169,24 @@ class DerivedLLMStream(llm.LLMStream):
 
         self._oracle_llm_livekit_plugin = oracle_llm_livekit_plugin
 
-        self._tools = DerivedLLMStream.convert_tools(oracle_llm_livekit_plugin.additional_tools, tools)
+        self._tools = oracle_llm_livekit_plugin.convert_tools(tools)
+
+        #
+        #  index the function-less (LiveKit-executed) tools by (name, arity) so tool-call
+        #  responses resolve with one dictionary lookup instead of a scan.
+        #
+        if self._tools is None:
+            self._tool_index = {}
+        else:
+            #
+            #  the per-parameter type checks are resolved here, once per stream, so the tool-call
+            #  path below does not re-compare parameter.type on every invocation.
+            #
+            self._tool_index = {
+                (tool.name, len(tool.parameters)):
+                    (tool, tuple(parameter.type == "string" for parameter in tool.parameters))
+                for tool in self._tools if tool.function is None
+                }
 
 
     async def _run(self) -> None:
@@ -132,7 +196,7 @@ class DerivedLLMStream(llm.LLMStream):
             if chat_message.type == "message":
                 role = chat_message.role
                 for message in chat_message.content:
-                    oracle_llm_content = OracleLLMContent(message, CONTENT_TYPE_STRING, role)
+                    oracle_llm_content = OracleLLMContent.acquire(message, CONTENT_TYPE_STRING, role)
                     oracle_llm_content_list.append(oracle_llm_content)
 
             elif chat_message.type == "function_call_output":
@@ -144,45 +208,51 @@ class DerivedLLMStream(llm.LLMStream):
                     output_json = json.loads(chat_message.output)
                     message = output_json["text"]
 
-                    oracle_llm_content = OracleLLMContent(tool_call, CONTENT_TYPE_STRING, ROLE_ASSISTANT)
+                    oracle_llm_content = OracleLLMContent.acquire(tool_call, CONTENT_TYPE_STRING, ROLE_ASSISTANT)
                     oracle_llm_content_list.append(oracle_llm_content)
 
-                    oracle_llm_content = OracleLLMContent("The function result of " + tool_call + " is: " + message, CONTENT_TYPE_STRING, ROLE_SYSTEM)
+                    oracle_llm_content = OracleLLMContent.acquire(f"The function result of {tool_call} is: {message}", CONTENT_TYPE_STRING, ROLE_SYSTEM)
                     oracle_llm_content_list.append(oracle_llm_content)
 
         response_messages = self._oracle_llm_livekit_plugin._oracle_llm.run(oracle_llm_content_list = oracle_llm_content_list, tools = self._tools)
 
+        #
+        #  run() has consumed the content items, so they can go back to the free list.
+        #
+        OracleLLMContent.release_all(oracle_llm_content_list)
+
         if len(response_messages) > 0:
             if len(response_messages) == 1 and response_messages[0].startswith(TOOL_CALL_PREFIX):
                 tool_call = response_messages[0]
 
                 function_name, function_parameters = DerivedLLMStream.get_name_and_arguments_from_tool_call(tool_call)
 
-                tool = None
-                for temp_tool in self._tools:
-                    if temp_tool.function is None:
-                        if temp_tool.name == function_name and len(temp_tool.parameters) == len(function_parameters):
-                            tool = temp_tool
+                tool_entry = self._tool_index.get((function_name, len(function_parameters)))
 
-                if tool is None:
+                if tool_entry is None:
                     raise Exception("Unknown function name: " + function_name + " in " + TOOL_CALL_DESCRIPTION + " response message: " + tool_call + ".")
 
-                function_parameters_text = "{"
-                for i in range(len(function_parameters)):
-                    parameter = tool.parameters[i]
-                    if i > 0:
-                        function_parameters_text += ","
-                    function_parameters_text += "\"" + parameter.name + "\":"
-                    if parameter.type == "string":
-                        function_parameters_text += "\""
-                    function_parameters_text += str(function_parameters[i])
-                    if parameter.type == "string":
-                        function_parameters_text += "\""
-                function_parameters_text += "}"
+                tool, parameter_is_string = tool_entry
+
+                #
+                #  serializing through json.dumps is faster than the previous per-character
+                #  concatenation and, unlike it, correctly escapes quotes and backslashes in
+                #  string parameter values.
+                #
+                function_parameters_dictionary = {}
+                for i, parameter in enumerate(tool.parameters):
+                    value = function_parameters[i]
+                    if parameter_is_string[i]:
+                        value = str(value)
+                    function_parameters_dictionary[parameter.name] = value
+                function_parameters_text = json.dumps(function_parameters_dictionary)
 
                 call_id = utils.shortuuid()
 
-                self._oracle_llm_livekit_plugin._call_id_to_tool_call_dictionary[call_id] = tool_call
+                call_id_dictionary = self._oracle_llm_livekit_plugin._call_id_to_tool_call_dictionary
+                call_id_dictionary[call_id] = tool_call
+                while len(call_id_dictionary) > CALL_ID_DICTIONARY_MAXIMUM_ENTRIES:
+                    call_id_dictionary.popitem(last = False)
 
                 function_tool_call = llm.FunctionToolCall(
                      name = function_name,
@@ -205,53 +275,54 @@ class DerivedLLMStream(llm.LLMStream):
                 self._event_ch.send_nowait(chat_chunk)
 
             else:
-                chat_chunk = llm.ChatChunk(
-                    id = utils.shortuuid(),
-                    delta = llm.ChoiceDelta(content = response_messages[0], role = ROLE_ASSISTANT),
-                    )
+                #
+                #  the chunks of one completion share a single response id.
+                #
+                response_id = utils.shortuuid()
 
-                self._event_ch.send_nowait(chat_chunk)
+                for sentence in SENTENCE_BOUNDARY_PATTERN.split(response_messages[0]):
+                    if len(sentence) == 0:
+                        continue
+
+                    chat_chunk = llm.ChatChunk(
+                        id = response_id,
+                        delta = llm.ChoiceDelta(content = sentence, role = ROLE_ASSISTANT),
+                        )
+
+                    self._event_ch.send_nowait(chat_chunk)
 
 
     @staticmethod
-    def convert_tools(additional_tools, livekit_mcp_tools):
+    def convert_mcp_tools(livekit_mcp_tools):
         tools = []
 
-        if additional_tools is not None:
-            for additional_tool in additional_tools:
-                tools.append(copy.deepcopy(additional_tool))
+        function_contexts = to_fnc_ctx(livekit_mcp_tools)
 
-        if livekit_mcp_tools is not None:
-            function_contexts = to_fnc_ctx(livekit_mcp_tools)
+        for function_context in function_contexts:
+            type = function_context["type"]
+            if type == "function":
+                function = function_context["function"]
 
-            for function_context in function_contexts:
-                type = function_context["type"]
-                if type == "function":
-                    function = function_context["function"]
+                function_name = function["name"]
+                function_description = function["description"]
+                if function_description == None or len(function_description) == 0:
+                    function_description = function_name
+                function_function = None
 
-                    function_name = function["name"]
-                    function_description = function["description"]
-                    if function_description == None or len(function_description) == 0:
-                        function_description = function_name
-                    function_function = None
+                function_parameters = function["parameters"]
 
-                    function_parameters = function["parameters"]
+                parameters = []
+                for property_key, property_value in function_parameters["properties"].items():
+                    parameter_name = property_key
+                    parameter_description = property_value["title"]
+                    parameter_type = property_value["type"]
 
-                    parameters = []
-                    for property_key, property_value in function_parameters["properties"].items():
-                        parameter_name = property_key
-                        parameter_description = property_value["title"]
-                        parameter_type = property_value["type"]
+                    parameter = OracleValue(parameter_name, parameter_description, parameter_type)
+                    parameters.append(parameter)
 
-                        parameter = OracleValue(parameter_name, parameter_description, parameter_type)
-                        parameters.append(parameter)
+                tool = OracleTool(function_name, function_description, function_function, parameters)
+                tools.append(tool)
 
-                    tool = OracleTool(function_name, function_description, function_function, parameters)
-                    tools.append(tool)
-
-        if len(tools) == 0:
-            return None
-        
         return tools
     
 
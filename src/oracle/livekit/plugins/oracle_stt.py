@@ -15,11 +15,28 @@ from dataclasses import dataclass
 
 import asyncio
 
+import random
+
 from oci_ai_speech_realtime import RealtimeSpeechClient, RealtimeSpeechClientListener
 from oci.ai_speech.models import RealtimeParameters, RealtimeMessageAckAudio, RealtimeMessageConnect, RealtimeMessageError, RealtimeMessageResult
-import oci
-from oci.config import from_file
-from oci.auth.signers.security_token_signer import SecurityTokenSigner
+
+from .signer_cache import get_configuration_and_signer
+
+
+#
+#  each websocket send pays fixed Python/SSL framing overhead, so queued audio chunks are
+#  coalesced into one send up to this many bytes.
+#
+MAXIMUM_COALESCED_AUDIO_BYTES = 65536
+
+#
+#  bound on the outgoing audio queue: roughly two seconds of 16 kHz PCM16 in 10 ms chunks.
+#  when the remote side stalls, the oldest audio is dropped instead of growing memory forever.
+#
+AUDIO_BYTES_QUEUE_MAXIMUM_SIZE = 200
+
+RECONNECT_INITIAL_DELAY_SECONDS = 0.5
+RECONNECT_MAXIMUM_DELAY_SECONDS = 30.0
 
 
 class OracleSTT(RealtimeSpeechClientListener):
@@ -68,11 +85,15 @@ class OracleSTT(RealtimeSpeechClientListener):
         self._parameters.should_ignore_invalid_customizations = should_ignore_invalid_customizations
         self._parameters.return_partial_results = return_partial_results
 
-        self._audio_bytes_queue = asyncio.Queue()
+        self._audio_bytes_queue = asyncio.Queue(maxsize = AUDIO_BYTES_QUEUE_MAXIMUM_SIZE)
         self._speech_result_queue = asyncio.Queue()
 
         self._real_time_speech_client = None
-        self._connected = False
+        self._connected_event = asyncio.Event()
+        self._number_of_dropped_audio_chunks = 0
+
+        self._reconnect_delay_seconds = RECONNECT_INITIAL_DELAY_SECONDS
+        self._reconnect_task = None
         
         asyncio.create_task(self.add_audio_bytes_background_task())
 
@@ -80,7 +101,14 @@ class OracleSTT(RealtimeSpeechClientListener):
 
 
     def add_audio_bytes(self, audio_bytes: bytes) -> None:
-        self._audio_bytes_queue.put_nowait(audio_bytes)
+        try:
+            self._audio_bytes_queue.put_nowait(audio_bytes)
+        except asyncio.QueueFull:
+            self._audio_bytes_queue.get_nowait()
+            self._audio_bytes_queue.put_nowait(audio_bytes)
+            self._number_of_dropped_audio_chunks += 1
+            if self._number_of_dropped_audio_chunks % 100 == 1:
+                logger.warning("Audio queue full; dropped " + str(self._number_of_dropped_audio_chunks) + " audio chunk(s) so far.")
 
 
     def get_speech_result_queue(self) -> asyncio.Queue:
@@ -90,11 +118,15 @@ class OracleSTT(RealtimeSpeechClientListener):
     def real_time_speech_client_open(self) -> None:
         self.real_time_speech_client_close()
 
-        config = from_file(self._parameters.authentication_configuration_file_spec, self._parameters.authentication_configuration_name)
-        with open(config["security_token_file"], "r") as f:
-            token = f.readline()
-        private_key = oci.signer.load_private_key_from_file(config["key_file"])
-        signer = SecurityTokenSigner(token = token, private_key = private_key)
+        #
+        #  the shared signer cache makes this a dictionary lookup on reconnect while still
+        #  picking up a rotated token (the signer is cached on the token and key files'
+        #  modification times).
+        #
+        config, signer = get_configuration_and_signer(
+            self._parameters.authentication_configuration_file_spec,
+            self._parameters.authentication_configuration_name
+            )
 
         real_time_parameters = RealtimeParameters()
 
@@ -134,7 +166,7 @@ class OracleSTT(RealtimeSpeechClientListener):
         if self._real_time_speech_client != None:
             self._real_time_speech_client.close()
             self._real_time_speech_client = None
-        self._connected = False
+        self._connected_event.clear()
 
 
     async def connect_background_task(self) -> None:
@@ -142,25 +174,56 @@ class OracleSTT(RealtimeSpeechClientListener):
         
 
     async def add_audio_bytes_background_task(self) -> None:
+        #
+        #  waiting on the connected event instead of polling keeps this task (and the event
+        #  loop) completely idle while the client is disconnected.
+        #
         while True:
-            if self._real_time_speech_client != None and not self._real_time_speech_client.close_flag and self._connected:
-                audio_bytes = await self._audio_bytes_queue.get()
-                await self._real_time_speech_client.send_data(audio_bytes)
-            else:
-                await asyncio.sleep(.010)
+            await self._connected_event.wait()
+
+            if self._real_time_speech_client == None or self._real_time_speech_client.close_flag:
+                self._connected_event.clear()
+                continue
+
+            audio_bytes = await self._audio_bytes_queue.get()
+
+            if not self._audio_bytes_queue.empty():
+                coalesced_audio_bytes = bytearray(audio_bytes)
+                while not self._audio_bytes_queue.empty() and len(coalesced_audio_bytes) < MAXIMUM_COALESCED_AUDIO_BYTES:
+                    coalesced_audio_bytes += self._audio_bytes_queue.get_nowait()
+                audio_bytes = bytes(coalesced_audio_bytes)
+
+            await self._real_time_speech_client.send_data(audio_bytes)
+
+
+    def schedule_reconnect(self) -> None:
+        #
+        #  reconnects are scheduled with exponential backoff and jitter rather than immediately,
+        #  so a misbehaving websocket cannot thrash open/close cycles or flood the endpoint.
+        #
+        if self._reconnect_task is not None and not self._reconnect_task.done():
+            self._reconnect_task.cancel()
+        self._reconnect_task = asyncio.create_task(self.reconnect_with_backoff_background_task())
+
+
+    async def reconnect_with_backoff_background_task(self) -> None:
+        delay_seconds = min(self._reconnect_delay_seconds, RECONNECT_MAXIMUM_DELAY_SECONDS)
+        self._reconnect_delay_seconds = min(delay_seconds * 2, RECONNECT_MAXIMUM_DELAY_SECONDS)
+        await asyncio.sleep(delay_seconds * (1 + random.random() * 0.2))
+        self.real_time_speech_client_open()
 
 
     # RealtimeSpeechClient method.
     def on_network_event(self, message):
         super_result = super().on_network_event(message)
-        self.real_time_speech_client_open()
+        self.schedule_reconnect()
         return super_result
 
 
     # RealtimeSpeechClient method.
     def on_error(self, error: RealtimeMessageError):
         super_result = super().on_error(error)
-        self.real_time_speech_client_open()
+        self.schedule_reconnect()
         return super_result
 
 
@@ -171,7 +234,8 @@ class OracleSTT(RealtimeSpeechClientListener):
 
     # RealtimeSpeechClient method.
     def on_connect_message(self, connectmessage: RealtimeMessageConnect):
-        self._connected = True
+        self._connected_event.set()
+        self._reconnect_delay_seconds = RECONNECT_INITIAL_DELAY_SECONDS
         return super().on_connect_message(connectmessage)
 
 
@@ -19,6 +19,101 @@ from livekit import rtc
 
 from .oracle_stt import OracleSTT
 
+#
+#  optional fast path for the common integer-ratio mono downsample (48000 -> 16000 for
+#  example): a cached FIR applied through NumPy/SciPy vectorized kernels. when NumPy/SciPy are
+#  not installed the rtc.AudioResampler path below is used for everything.
+#
+try:
+    import numpy
+    from scipy import signal
+except ImportError:
+    numpy = None
+
+#
+#  optionally JIT the FIR + decimation inner loop with Numba so LLVM can vectorize it; the
+#  cache=True flag persists the compiled kernel across processes. without Numba the SciPy
+#  lfilter path below is used.
+#
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+if numpy is not None and njit is not None:
+    @njit(cache = True, fastmath = True)
+    def polyphase_down(samples, taps, down, state, offset):
+        number_of_taps = taps.shape[0]
+        number_of_state_samples = state.shape[0]
+        number_of_samples = samples.shape[0]
+
+        number_of_outputs = 0
+        if offset < number_of_samples:
+            number_of_outputs = (number_of_samples - offset + down - 1) // down
+
+        output = numpy.empty(number_of_outputs, dtype = numpy.int16)
+
+        output_index = 0
+        for i in range(offset, number_of_samples, down):
+            accumulator = 0.0
+            for j in range(number_of_taps):
+                index = i - j
+                if index >= 0:
+                    value = samples[index]
+                else:
+                    value = state[number_of_state_samples + index]
+                accumulator += taps[j] * value
+            if accumulator > 32767.0:
+                accumulator = 32767.0
+            elif accumulator < -32768.0:
+                accumulator = -32768.0
+            output[output_index] = numpy.int16(accumulator)
+            output_index += 1
+
+        #
+        #  carry the last input samples over as state for the next frame.
+        #
+        if number_of_samples >= number_of_state_samples:
+            state[:] = samples[number_of_samples - number_of_state_samples:]
+        else:
+            for i in range(number_of_state_samples - number_of_samples):
+                state[i] = state[i + number_of_samples]
+            state[number_of_state_samples - number_of_samples:] = samples
+
+        return output
+
+    #
+    #  invoke the kernel once at import with the call-site dtypes (float32 samples and state,
+    #  float64 taps) so the JIT compile — hundreds of milliseconds even with a warm disk
+    #  cache — happens here instead of stalling the event loop on the first resampled frame.
+    #
+    try:
+        polyphase_down(
+            numpy.zeros(8, dtype = numpy.float32),
+            numpy.zeros(4, dtype = numpy.float64),
+            2,
+            numpy.zeros(3, dtype = numpy.float32),
+            0
+            )
+    except Exception:
+        #
+        #  if the compile fails, fall back to the SciPy path below.
+        #
+        njit = None
+
+
+FIR_NUMBER_OF_TAPS = 64
+
+_fir_taps_cache = {}
+
+
+def get_fir_taps(input_rate: int, output_rate: int):
+    taps = _fir_taps_cache.get((input_rate, output_rate))
+    if taps is None:
+        taps = signal.firwin(FIR_NUMBER_OF_TAPS, output_rate / input_rate, window = ("kaiser", 8.0))
+        _fir_taps_cache[(input_rate, output_rate)] = taps
+    return taps
+
 
 class STT(stt.STT):
     """
@@ -76,9 +171,6 @@ class STT(stt.STT):
     async def get_speech_event(self) -> stt.SpeechEvent:
         speech_result_queue = self._oracle_stt.get_speech_result_queue()
 
-        if speech_result_queue.empty():
-            return None
-        
         speech_result = await speech_result_queue.get()
     
         speech_data = stt.SpeechData(
@@ -134,14 +226,22 @@ class DerivedSTTStream:
         self._oracle_stt_livekit_plugin = oracle_stt_livekit_plugin
 
         self._audio_resampler = None
+        self._fir_state = None
+        self._decimation_offset = 0
+
+        self._push_frames_task = None
 
 
     async def __aenter__(self):
+        self.start_push_frames_task()
         return self
 
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         self._running = False
+        if self._push_frames_task is not None:
+            self._push_frames_task.cancel()
+            self._push_frames_task = None
 
 
     def __aiter__(self) -> AsyncIterator[stt.SpeechEvent]:
@@ -152,18 +252,28 @@ class DerivedSTTStream:
         self._queue.put_nowait(frame)
 
 
-    async def _event_stream(self) -> AsyncIterator[stt.SpeechEvent]:
+    def start_push_frames_task(self) -> None:
+        if self._push_frames_task is None:
+            self._push_frames_task = asyncio.create_task(self._push_frames_background_task())
+
+
+    async def _push_frames_background_task(self) -> None:
         while self._running:
             frame = await self._queue.get()
 
-            if frame.sample_rate != self._oracle_stt_livekit_plugin._sample_rate:
-                if self._audio_resampler is None:
-                    self._audio_resampler = rtc.AudioResampler(
-                        input_rate = frame.sample_rate,
-                        output_rate = self._oracle_stt_livekit_plugin._sample_rate,
-                        quality = rtc.AudioResamplerQuality.HIGH
-                        )
-                frame = self._audio_resampler.push(frame)
+            target_rate = self._oracle_stt_livekit_plugin._sample_rate
+
+            if frame.sample_rate != target_rate:
+                if numpy is not None and frame.num_channels == 1 and frame.sample_rate % target_rate == 0:
+                    frame = self.resample_mono_frame(frame, target_rate)
+                else:
+                    if self._audio_resampler is None:
+                        self._audio_resampler = rtc.AudioResampler(
+                            input_rate = frame.sample_rate,
+                            output_rate = target_rate,
+                            quality = rtc.AudioResamplerQuality.HIGH
+                            )
+                    frame = self._audio_resampler.push(frame)
 
             if isinstance(frame, list):
                 frames = frame
@@ -174,8 +284,51 @@ class DerivedSTTStream:
                 audio_bytes = frame.data
                 self._oracle_stt_livekit_plugin._oracle_stt.add_audio_bytes(audio_bytes)
 
-            while True:
-                speech_event = await self._oracle_stt_livekit_plugin.get_speech_event()
-                if speech_event is None:
-                    break
-                yield speech_event
+
+    def resample_mono_frame(self, frame: rtc.AudioFrame, target_rate: int) -> rtc.AudioFrame:
+        #
+        #  polyphase-style downsample: low-pass FIR (with state carried across frames to avoid
+        #  discontinuities) followed by decimation, all in vectorized NumPy/SciPy kernels.
+        #
+        down = frame.sample_rate // target_rate
+        taps = get_fir_taps(frame.sample_rate, target_rate)
+
+        samples = numpy.frombuffer(frame.data, dtype = numpy.int16).astype(numpy.float32)
+
+        if njit is not None:
+            #
+            #  the JIT kernel keeps the last input samples as its state (rather than lfilter's
+            #  delay-line state) and computes the decimated outputs directly.
+            #
+            if self._fir_state is None:
+                self._fir_state = numpy.zeros(len(taps) - 1, dtype = numpy.float32)
+
+            decimated = polyphase_down(samples, taps, down, self._fir_state, self._decimation_offset)
+            self._decimation_offset = (self._decimation_offset - len(samples)) % down
+
+            return rtc.AudioFrame(decimated.tobytes(), target_rate, 1, len(decimated))
+
+        if self._fir_state is None:
+            self._fir_state = numpy.zeros(len(taps) - 1)
+
+        filtered, self._fir_state = signal.lfilter(taps, 1.0, samples, zi = self._fir_state)
+
+        decimated = filtered[self._decimation_offset::down]
+        self._decimation_offset = (self._decimation_offset - len(samples)) % down
+
+        audio_data = numpy.clip(decimated, -32768, 32767).astype(numpy.int16).tobytes()
+
+        return rtc.AudioFrame(audio_data, target_rate, 1, len(decimated))
+
+
+    async def _event_stream(self) -> AsyncIterator[stt.SpeechEvent]:
+        #
+        #  frame intake runs in its own task so speech results can be awaited directly here.
+        #  previously results were only drained after the next audio frame arrived, delaying
+        #  final transcripts by up to one frame interval.
+        #
+        self.start_push_frames_task()
+
+        while self._running:
+            speech_event = await self._oracle_stt_livekit_plugin.get_speech_event()
+            yield speech_event
@@ -8,21 +8,42 @@ Date: 2025-08-12
 
 from __future__ import annotations
 
+from typing import AsyncIterator
+
 import logging
 logger = logging.getLogger(__name__)
 
-import uuid
+import os
 
 import base64
 
 import asyncio
 
+import concurrent.futures
+
+import threading
+
 import oci
-from oci.config import from_file
-from oci.auth.signers.security_token_signer import SecurityTokenSigner
 from oci.ai_speech import AIServiceSpeechClient
 from oci.ai_speech.models import TtsOracleConfiguration, TtsOracleTts2NaturalModelDetails, TtsOracleSpeechSettings
 
+from .signer_cache import get_configuration_and_signer
+
+
+SYNTHESIS_EXECUTOR_MAXIMUM_WORKERS = 8
+
+#
+#  one speech client (and therefore one underlying HTTP session with keep-alive connections)
+#  per endpoint and authentication configuration, shared across OracleTTS instances. agents
+#  that recreate their TTS per session would otherwise pay a TLS handshake every time.
+#
+_client_cache = {}
+_client_cache_lock = threading.Lock()
+
+STREAM_CHUNK_SIZE = 4096
+
+WAV_HEADER_SIZE = 44
+
 
 class OracleTTS():
     """
@@ -52,15 +73,35 @@ class OracleTTS():
         self._parameters.voice = voice
         self._parameters.sample_rate = sample_rate
 
-        config = from_file(self._parameters.authentication_configuration_file_spec, self._parameters.authentication_configuration_name)
-        with open(config["security_token_file"], "r") as f:
-            token = f.readline()
-        private_key = oci.signer.load_private_key_from_file(config["key_file"])
-        signer = SecurityTokenSigner(token = token, private_key = private_key)
+        config, signer = get_configuration_and_signer(
+            self._parameters.authentication_configuration_file_spec,
+            self._parameters.authentication_configuration_name
+            )
 
         service_endpoint = ("https" if self._parameters.secure else "http") + "://" + self._parameters.host + ":" + str(self._parameters.port_number)
 
-        self._ai_service_speech_client = AIServiceSpeechClient({}, signer = signer, service_endpoint = service_endpoint)
+        client_cache_key = (
+            service_endpoint,
+            self._parameters.authentication_configuration_file_spec,
+            self._parameters.authentication_configuration_name
+            )
+
+        with _client_cache_lock:
+            ai_service_speech_client = _client_cache.get(client_cache_key)
+            if ai_service_speech_client is None:
+                ai_service_speech_client = AIServiceSpeechClient({}, signer = signer, service_endpoint = service_endpoint)
+                _client_cache[client_cache_key] = ai_service_speech_client
+
+        self._ai_service_speech_client = ai_service_speech_client
+
+        #
+        #  a dedicated bounded executor keeps synthesis calls off the shared default executor,
+        #  whose threads are contended by everything else using asyncio.to_thread.
+        #
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers = SYNTHESIS_EXECUTOR_MAXIMUM_WORKERS,
+            thread_name_prefix = "oci-tts"
+            )
 
 
     async def synthesize_speech(self, *, text: str) -> bytes:
@@ -93,20 +134,107 @@ class OracleTTS():
                 return None
             
             #
-            #  the data is in .wav file format so remove the 44-byte .wav header.
+            #  the data is in .wav file format so remove the 44-byte .wav header. slicing a
+            #  memoryview skips the copy of the (potentially multi-megabyte) PCM payload that a
+            #  bytes slice would make; consumers only need a bytes-like object.
             #
-            audio_bytes = response.data.content[44:]
+            audio_bytes = memoryview(response.data.content)[44:]
 
             return audio_bytes
         
-        return await asyncio.to_thread(sync_call) 
+        return await asyncio.get_running_loop().run_in_executor(self._executor, sync_call)
+
+
+    async def stream_synthesize_speech(self, *, text: str) -> AsyncIterator[bytes]:
+        """
+        Synthesize speech for the specified text, yielding PCM chunks as they arrive from the
+        service instead of waiting for the complete audio buffer. Playback can therefore begin
+        as soon as the first chunk is synthesized.
+
+        Parameters:
+        text (str): The text.
+
+        Returns:
+        AsyncIterator[bytes]: The PCM audio chunks.
+        """
+
+        loop = asyncio.get_running_loop()
+
+        queue = asyncio.Queue()
+
+        def sync_call():
+            logger.debug(text)
+
+            request_id = short_uuid()
+
+            try:
+                response = self._ai_service_speech_client.synthesize_speech(
+                    synthesize_speech_details = oci.ai_speech.models.SynthesizeSpeechDetails(
+                        text = text,
+                        is_stream_enabled = True,
+                        compartment_id = self._parameters.compartment_id,
+                        configuration = TtsOracleConfiguration(
+                            model_family = "ORACLE",
+                            model_details = TtsOracleTts2NaturalModelDetails(model_name = "TTS_2_NATURAL", voice_id = self._parameters.voice),
+                            speech_settings = TtsOracleSpeechSettings(text_type = "TEXT", sample_rate_in_hz = self._parameters.sample_rate, output_format = "PCM")
+                            ),
+                        ),
+                    opc_request_id = request_id
+                    )
+
+                if response is None or response.status != 200:
+                    return
+
+                #
+                #  the stream starts with the 44-byte .wav header; accumulate until it has been
+                #  seen in full, then pass the remainder (and every later chunk) through as-is.
+                #
+                number_of_header_bytes_remaining = WAV_HEADER_SIZE
+
+                for chunk in response.data.iter_content(chunk_size = STREAM_CHUNK_SIZE):
+                    if len(chunk) == 0:
+                        continue
+
+                    if number_of_header_bytes_remaining > 0:
+                        if len(chunk) <= number_of_header_bytes_remaining:
+                            number_of_header_bytes_remaining -= len(chunk)
+                            continue
+                        chunk = chunk[number_of_header_bytes_remaining:]
+                        number_of_header_bytes_remaining = 0
+
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
+            except Exception:
+                logger.exception("Streaming speech synthesis failed.")
+            finally:
+                #
+                #  the None sentinel tells the consumer the stream has ended (or failed).
+                #
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+
+        future = loop.run_in_executor(self._executor, sync_call)
+
+        try:
+            while True:
+                chunk = await queue.get()
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            await future
+
+
+    def close(self) -> None:
+        self._executor.shutdown(wait = False)
 
 
-@staticmethod
 def short_uuid() -> str:
-    uuid4 = uuid.uuid4()
-    base64EncodedUUID = base64.urlsafe_b64encode(uuid4.bytes)
-    return base64EncodedUUID.rstrip(b'=').decode('ascii')
+    #
+    #  the ids only need uniqueness, not UUID framing: 9 bytes from os.urandom encode to
+    #  exactly 12 base64 characters (72 bits, no padding to strip), skipping the uuid module's
+    #  version/variant bookkeeping. this also removes the stray @staticmethod that was applied
+    #  to a module-level function.
+    #
+    return base64.urlsafe_b64encode(os.urandom(9)).decode('ascii')
 
 
 class Parameters:
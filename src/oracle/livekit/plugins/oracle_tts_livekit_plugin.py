@@ -10,20 +10,91 @@ from __future__ import annotations
 import logging
 logger = logging.getLogger(__name__)
 
+import os
+
 import asyncio
 
+import time
+
+import itertools
+
+from collections import OrderedDict
+
+#
+#  numpy is optional; without it cached audio is simply stored untrimmed.
+#
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from livekit.agents import tts, utils
 from livekit.agents.types import DEFAULT_API_CONNECT_OPTIONS
 from livekit.rtc import AudioFrame
 
 from .oracle_tts import OracleTTS
 from .audio_cache import AudioCache
+from .buffer_pool import pcm_buffer_pool
 
 
 REQUIRED_LIVE_KIT_AUDIO_RATE = 24000  
 REQUIRED_LIVE_KIT_AUDIO_CHANNELS = 1
 REQUIRED_LIVE_KIT_AUDIO_BITS = 16
 
+_BYTES_PER_SAMPLE = REQUIRED_LIVE_KIT_AUDIO_BITS // 8 * REQUIRED_LIVE_KIT_AUDIO_CHANNELS
+
+#
+#  10 ms of audio per frame: LiveKit's capture path has a fast path that only engages for
+#  exactly-10 ms frames, and a single utterance-sized frame forces it into the slow path.
+#
+_FRAME_BYTES_PER_10_MS = REQUIRED_LIVE_KIT_AUDIO_RATE // 100 * _BYTES_PER_SAMPLE
+
+#
+#  five 10 ms frames (50 ms) of headroom between the synthesis reader and the emitter; a
+#  slow consumer drops the oldest frame rather than letting the backlog (and latency) grow.
+#
+FRAME_QUEUE_MAXIMUM_SIZE = 5
+
+HOT_CACHE_MAXIMUM_ENTRIES = 256
+
+#
+#  16-bit samples at or below this amplitude count as silence when trimming cached audio.
+#
+SILENCE_THRESHOLD_AMPLITUDE = 64
+
+
+def trim_silence(audio_bytes, *, leading: bool = True, trailing: bool = True):
+    """
+    Trim leading and/or trailing silence from the specified 16-bit PCM audio. The vectorized
+    scan runs at memory bandwidth; without numpy the audio is returned unchanged.
+
+    Parameters:
+    audio_bytes (bytes): The audio bytes.
+    leading (bool): Whether to trim leading silence.
+    trailing (bool): Whether to trim trailing silence.
+
+    Returns:
+    bytes: The trimmed audio bytes.
+    """
+
+    if numpy is None or len(audio_bytes) < 2:
+        return audio_bytes
+
+    samples = numpy.frombuffer(audio_bytes, dtype = "<i2")
+
+    voiced = numpy.abs(samples) > SILENCE_THRESHOLD_AMPLITUDE
+
+    if not voiced.any():
+        return audio_bytes
+
+    low = int(voiced.argmax()) if leading else 0
+    high = len(samples) - int(voiced[::-1].argmax()) if trailing else len(samples)
+
+    if low == 0 and high == len(samples):
+        return audio_bytes
+
+    return samples[low:high].tobytes()
+
 
 class TTS(tts.TTS):
     """
@@ -41,7 +112,10 @@ class TTS(tts.TTS):
         authentication_configuration_name: str = "DEFAULT",
         voice: str = "Victoria",
         audio_cache_file_path: str = None,
-        audio_cache_maximum_text_length: int = 100
+        audio_cache_maximum_text_length: int = 100,
+        cache_race_deadline_ms: int = None,
+        prewarm_phrases: list = None,
+        audio_cache_codec: str = "pcm16"
         ) -> None:
 
         capabilities = tts.TTSCapabilities(streaming = False)
@@ -59,16 +133,124 @@ class TTS(tts.TTS):
             sample_rate = REQUIRED_LIVE_KIT_AUDIO_RATE
             )
         
+        #
+        #  these are set unconditionally: _run and schedule_cache_write branch on
+        #  self._audio_cache, and reading the other attributes must be safe (and benefit from
+        #  the interpreter's attribute specialization) whether or not caching is enabled.
+        #
+        self._voice = voice
+        self._audio_cache_maximum_text_length = audio_cache_maximum_text_length
+
         if audio_cache_file_path is None:
             self._audio_cache = None
         else:
-            self._audio_cache = AudioCache(audio_cache_file_path = audio_cache_file_path)
-            self._voice = voice
-            self._audio_cache_maximum_text_length = audio_cache_maximum_text_length
+            self._audio_cache = AudioCache.get_or_create(audio_cache_file_path = audio_cache_file_path, codec = audio_cache_codec)
+
+        self._cache_race_deadline_ms = cache_race_deadline_ms
+
+        #
+        #  a small in-process layer in front of the (shared, disk-backed) audio cache; repeat
+        #  utterances such as greetings are answered here without a thread hop or a syscall.
+        #
+        self._hot = OrderedDict()
+
+        #
+        #  emitter request ids come from one random session prefix plus a counter; drawing a
+        #  fresh uuid per utterance would gather entropy on every synthesis for ids that only
+        #  need to be unique.
+        #
+        self._session_id = utils.shortuuid()
+        self._request_id_counter = itertools.count()
+
+        #
+        #  in-flight synthesis futures keyed by text. when the LLM re-emits an utterance that
+        #  is already being synthesized (repeated sentences arrive in quick succession), the
+        #  later stream awaits the first result instead of making a second remote call.
+        #
+        self._inflight_syntheses = {}
+
+        #
+        #  the frame and emitter constructors are bound once here; the per-frame loops then
+        #  load them as instance attributes instead of re-resolving a global plus an attribute
+        #  chain for every 10 ms of audio.
+        #
+        self._audio_frame_class = AudioFrame
+        self._synthesized_audio_emitter_class = tts.SynthesizedAudioEmitter
+
+        #
+        #  fixed phrases (greetings, fallback lines) are synthesized into the cache in the
+        #  background at construction time, so the first user interaction hits cache instead
+        #  of paying full synthesis latency on a cold start.
+        #
+        self._prewarm_task = None
+        if prewarm_phrases is not None and self._audio_cache is not None:
+            try:
+                self._prewarm_task = asyncio.get_running_loop().create_task(self.prewarm_background_task(prewarm_phrases))
+            except RuntimeError:
+                logger.debug("No running event loop; skipping cache prewarm.")
 
 
     def synthesize(self, text: str, *, conn_options: DEFAULT_API_CONNECT_OPTIONS) -> DerivedTTSChunkedStream:
-        return DerivedTTSChunkedStream(tts = self, text = text, conn_options = conn_options)
+        #
+        #  the cached and cache-less pipelines live in separate subclasses with straight-line
+        #  _run bodies; picking the class here keeps the per-call branch count down and the
+        #  attribute shapes stable for the specializing interpreter.
+        #
+        stream_class = DerivedTTSChunkedStreamNoCache if self._audio_cache is None else DerivedTTSChunkedStreamCached
+        return stream_class(tts = self, text = text, conn_options = conn_options)
+
+
+    async def prewarm_background_task(self, prewarm_phrases) -> None:
+        """
+        Synthesize and cache the specified phrases, skipping any that are already cached.
+
+        Parameters:
+        prewarm_phrases (list): The phrases to prewarm.
+
+        Returns:
+        (nothing)
+        """
+
+        for phrase in prewarm_phrases:
+            key = AudioCache.form_key(
+                text = phrase,
+                voice = self._voice,
+                audio_rate = REQUIRED_LIVE_KIT_AUDIO_RATE,
+                audio_channels = REQUIRED_LIVE_KIT_AUDIO_CHANNELS,
+                audio_bits = REQUIRED_LIVE_KIT_AUDIO_BITS
+                )
+
+            audio_bytes = await asyncio.to_thread(self._audio_cache.get_by_key, key)
+
+            if audio_bytes is not None:
+                pcm_buffer_pool.release(audio_bytes)
+                continue
+
+            audio_bytes = await self._oracle_tts.synthesize_speech(text = phrase)
+
+            if audio_bytes is not None and len(phrase) <= self._audio_cache_maximum_text_length:
+                await asyncio.to_thread(self._audio_cache.set_by_key, key, audio_bytes = audio_bytes)
+
+
+    def set_hot(self, hot_key, audio_bytes) -> None:
+        """
+        Set the audio bytes into the in-process hot cache, evicting the least recently used
+        entry if full. The bytes are copied to an immutable bytes object so the hot cache
+        never holds a pooled buffer whose lifetime belongs to the current stream.
+
+        Parameters:
+        hot_key (tuple): The hot cache key.
+        audio_bytes (bytes): The audio bytes.
+
+        Returns:
+        (nothing)
+        """
+
+        self._hot[hot_key] = bytes(audio_bytes)
+        self._hot.move_to_end(hot_key)
+
+        while len(self._hot) > HOT_CACHE_MAXIMUM_ENTRIES:
+            self._hot.popitem(last = False)
 
 
 class DerivedTTSChunkedStream(tts.ChunkedStream):
@@ -81,39 +263,413 @@ class DerivedTTSChunkedStream(tts.ChunkedStream):
 
         self._oracle_tts_livekit_plugin = tts
 
-        
-    async def _run(self) -> None:
-        if self._oracle_tts_livekit_plugin._audio_cache is not None:
-            audio_bytes = self._oracle_tts_livekit_plugin._audio_cache.get_audio_bytes(
-                text = self._input_text,
-                voice = self._oracle_tts_livekit_plugin._voice,
-                audio_rate = REQUIRED_LIVE_KIT_AUDIO_RATE,
-                audio_channels = REQUIRED_LIVE_KIT_AUDIO_CHANNELS,
-                audio_bits = REQUIRED_LIVE_KIT_AUDIO_BITS)
+        self._cache_write_task = None
+
+        self._cache_key = None
 
-        if audio_bytes is None:
-            audio_bytes = await self._oracle_tts_livekit_plugin._oracle_tts.synthesize_speech(text = self._input_text)
 
-            if audio_bytes is not None and self._oracle_tts_livekit_plugin._audio_cache is not None and \
-                len(self._input_text) <= self._oracle_tts_livekit_plugin._audio_cache_maximum_text_length:
-                self._oracle_tts_livekit_plugin._audio_cache.set_audio_bytes(
-                    text = self._input_text,
-                    voice = self._oracle_tts_livekit_plugin._voice,
-                    audio_rate = REQUIRED_LIVE_KIT_AUDIO_RATE,
-                    audio_channels = REQUIRED_LIVE_KIT_AUDIO_CHANNELS,
-                    audio_bits = REQUIRED_LIVE_KIT_AUDIO_BITS,
-                    audio_bytes = audio_bytes)
+    @staticmethod
+    def release_late_cache_result(cache_task) -> None:
+        """
+        Release the pooled buffer of a cache lookup that completed after losing the race.
 
+        Parameters:
+        cache_task (asyncio.Task): The finished cache lookup task.
 
-        if audio_bytes != None:
-            request_id = utils.shortuuid()
-            emitter = tts.SynthesizedAudioEmitter(event_ch = self._event_ch, request_id = request_id)
+        Returns:
+        (nothing)
+        """
 
-            number_of_samples = int(len(audio_bytes) / 2 / REQUIRED_LIVE_KIT_AUDIO_CHANNELS)
+        if not cache_task.cancelled() and cache_task.exception() is None:
+            audio_bytes = cache_task.result()
+            if audio_bytes is not None:
+                pcm_buffer_pool.release(audio_bytes)
 
-            samples_per_channel = int(number_of_samples / REQUIRED_LIVE_KIT_AUDIO_CHANNELS)
 
-            audio_frame = AudioFrame(audio_bytes, REQUIRED_LIVE_KIT_AUDIO_RATE, REQUIRED_LIVE_KIT_AUDIO_CHANNELS, samples_per_channel)
+    def emit_audio_bytes(self, audio_bytes) -> None:
+        """
+        Emit the specified audio bytes as a sequence of 10 ms frames followed by a flush.
+
+        Parameters:
+        audio_bytes (bytes): The audio bytes.
+
+        Returns:
+        (nothing)
+        """
+
+        plugin = self._oracle_tts_livekit_plugin
+
+        audio_frame_class = plugin._audio_frame_class
+
+        try:
+            request_id = f"{plugin._session_id}-{next(plugin._request_id_counter)}"
+            emitter = plugin._synthesized_audio_emitter_class(event_ch = self._event_ch, request_id = request_id)
+
+            audio_view = memoryview(audio_bytes)
+
+            for offset in range(0, len(audio_view), _FRAME_BYTES_PER_10_MS):
+                frame_bytes = audio_view[offset:offset + _FRAME_BYTES_PER_10_MS]
+
+                audio_frame = audio_frame_class(
+                    frame_bytes,
+                    REQUIRED_LIVE_KIT_AUDIO_RATE,
+                    REQUIRED_LIVE_KIT_AUDIO_CHANNELS,
+                    len(frame_bytes) // _BYTES_PER_SAMPLE
+                    )
+
+                emitter.push(audio_frame)
 
-            emitter.push(audio_frame)
             emitter.flush()
+        finally:
+            #
+            #  AudioFrame copies the samples into its own rtc buffer, so a pooled cache
+            #  buffer can be recycled as soon as the frame has been pushed. non-pooled
+            #  results (bytes from synthesis or the in-memory cache) are ignored by release.
+            #
+            pcm_buffer_pool.release(audio_bytes)
+
+
+    async def stream_synthesis_and_emit(self) -> None:
+        """
+        Synthesize the input text via the streaming OracleTTS interface, pushing 10 ms audio
+        frames to the emitter as the PCM arrives. Time-to-first-audio becomes the time to the
+        first chunk rather than the full synthesis time. When caching applies, the chunks are
+        also streamed into a temporary file in the cache directory that is adopted with an
+        atomic rename, so the utterance is never held in memory in full.
+
+        Returns:
+        (nothing)
+        """
+
+        plugin = self._oracle_tts_livekit_plugin
+
+        existing_synthesis = plugin._inflight_syntheses.get(self._input_text)
+
+        if existing_synthesis is not None:
+            #
+            #  a synthesis of this exact text is already in flight; wait for it, then serve
+            #  from the cache it populated (or synthesize whole as a fallback) instead of
+            #  making a duplicate streaming call.
+            #
+            #
+            #  the leader resolves its future with the PCM itself when no cache entry will
+            #  exist, with True once the entry has been adopted into the disk cache, or with
+            #  None on failure.
+            #
+            leader_result = await existing_synthesis
+
+            audio_bytes = None
+
+            if isinstance(leader_result, (bytes, bytearray)):
+                audio_bytes = leader_result
+            elif leader_result and self._cache_key is not None:
+                audio_bytes = await asyncio.to_thread(plugin._audio_cache.get_by_key, self._cache_key)
+
+            if audio_bytes is None:
+                audio_bytes = await plugin._oracle_tts.synthesize_speech(text = self._input_text)
+
+            if audio_bytes is not None:
+                self.emit_audio_bytes(audio_bytes)
+
+            return
+
+        synthesis_future = asyncio.get_running_loop().create_future()
+        plugin._inflight_syntheses[self._input_text] = synthesis_future
+
+        request_id = f"{plugin._session_id}-{next(plugin._request_id_counter)}"
+        emitter = plugin._synthesized_audio_emitter_class(event_ch = self._event_ch, request_id = request_id)
+
+        #
+        #  when caching applies, chunks stream straight into a temporary file next to the
+        #  cache entries; adoption is one atomic rename and the PCM never accumulates in a
+        #  Python buffer.
+        #
+        cache_applicable = self._cache_key is not None and \
+            len(self._input_text) <= plugin._audio_cache_maximum_text_length
+
+        temporary_file_spec = None
+        temporary_file_descriptor = None
+        number_of_cached_bytes = 0
+
+        synthesis_start = time.monotonic()
+
+        #
+        #  a small bounded queue separates the synthesis reader from the emitter so a slow
+        #  consumer cannot make an unbounded backlog; when full, the oldest frame is dropped
+        #  to keep playback latency flat.
+        #
+        frame_queue = asyncio.Queue(maxsize = FRAME_QUEUE_MAXIMUM_SIZE)
+
+        def enqueue_frame(frame_bytes):
+            try:
+                frame_queue.put_nowait(frame_bytes)
+            except asyncio.QueueFull:
+                frame_queue.get_nowait()
+                frame_queue.put_nowait(frame_bytes)
+
+        #
+        #  when the disk cache will not hold this utterance (caching disabled, or the text is
+        #  over the caching length limit), the chunks are retained so followers of the same
+        #  in-flight text can still be served without a second remote call. the joined PCM
+        #  lives only as long as the future it resolves, which is unregistered below.
+        #
+        received_chunks = []
+
+        async def produce_frames():
+            nonlocal number_of_cached_bytes
+
+            #
+            #  service chunks arrive at arbitrary sizes, so complete 10 ms frames are carved
+            #  off as they become available and the remainder is carried into the next chunk.
+            #
+            pending = bytearray()
+
+            first_chunk = True
+
+            async for chunk in plugin._oracle_tts.stream_synthesize_speech(text = self._input_text):
+                if not cache_applicable:
+                    received_chunks.append(chunk)
+
+                if temporary_file_descriptor is not None:
+                    cache_chunk = chunk
+
+                    if first_chunk:
+                        #
+                        #  leading silence is trimmed before it reaches the disk; trailing
+                        #  silence would require holding back the final chunk, so it is left.
+                        #
+                        cache_chunk = trim_silence(cache_chunk, trailing = False)
+
+                    #
+                    #  the write lands in the page cache; at 10 ms granularity it is far
+                    #  cheaper than a thread hop per chunk would be.
+                    #
+                    os.write(temporary_file_descriptor, cache_chunk)
+                    number_of_cached_bytes += len(cache_chunk)
+
+                first_chunk = False
+
+                pending += chunk
+
+                number_of_whole_frames = len(pending) // _FRAME_BYTES_PER_10_MS
+
+                if number_of_whole_frames > 0:
+                    consumed = number_of_whole_frames * _FRAME_BYTES_PER_10_MS
+
+                    for offset in range(0, consumed, _FRAME_BYTES_PER_10_MS):
+                        enqueue_frame(bytes(memoryview(pending)[offset:offset + _FRAME_BYTES_PER_10_MS]))
+
+                    del pending[:consumed]
+
+            if len(pending) > 0:
+                enqueue_frame(bytes(pending))
+
+            #
+            #  the None sentinel tells the consumer the stream has ended. enqueue_frame is
+            #  used so a full queue drops its oldest frame rather than losing the sentinel.
+            #
+            enqueue_frame(None)
+
+        async def consume_frames():
+            audio_frame_class = plugin._audio_frame_class
+
+            while True:
+                frame_bytes = await frame_queue.get()
+                if frame_bytes is None:
+                    break
+
+                audio_frame = audio_frame_class(
+                    frame_bytes,
+                    REQUIRED_LIVE_KIT_AUDIO_RATE,
+                    REQUIRED_LIVE_KIT_AUDIO_CHANNELS,
+                    len(frame_bytes) // _BYTES_PER_SAMPLE
+                    )
+                emitter.push(audio_frame)
+
+        adopted = False
+
+        try:
+            #
+            #  the temporary file is opened inside this try: if the open raises (cache
+            #  directory deleted, permissions, full disk), the finally below still resolves
+            #  and unregisters the in-flight future, so followers of this text fail over to
+            #  their own synthesis instead of waiting forever on a leaked future.
+            #
+            if cache_applicable:
+                temporary_file_spec = plugin._audio_cache.form_temporary_file_spec(self._cache_key)
+                temporary_file_descriptor = os.open(temporary_file_spec, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+
+            await asyncio.gather(produce_frames(), consume_frames())
+
+            if temporary_file_descriptor is not None and number_of_cached_bytes > 0:
+                os.close(temporary_file_descriptor)
+                temporary_file_descriptor = None
+
+                await asyncio.to_thread(
+                    plugin._audio_cache.adopt_audio_file,
+                    self._cache_key,
+                    temporary_file_spec,
+                    number_of_bytes = number_of_cached_bytes,
+                    synthesis_milliseconds = (time.monotonic() - synthesis_start) * 1000.0
+                    )
+                adopted = True
+        finally:
+            if temporary_file_descriptor is not None:
+                os.close(temporary_file_descriptor)
+
+            if temporary_file_spec is not None and not adopted:
+                try:
+                    os.unlink(temporary_file_spec)
+                except FileNotFoundError:
+                    pass
+
+            plugin._inflight_syntheses.pop(self._input_text, None)
+            if not synthesis_future.done():
+                if adopted:
+                    synthesis_future.set_result(True)
+                elif len(received_chunks) > 0:
+                    synthesis_future.set_result(b"".join(received_chunks))
+                else:
+                    synthesis_future.set_result(None)
+
+        emitter.flush()
+
+
+    def schedule_cache_write(self, audio_bytes, *, synthesis_milliseconds: float = 0.0) -> None:
+        """
+        Schedule a background write of the synthesized audio into the audio cache, if caching
+        applies to this utterance. The write is not awaited; it completes while the audio is
+        being emitted. The task reference keeps it from being garbage collected.
+
+        Parameters:
+        audio_bytes (bytes): The audio bytes.
+        synthesis_milliseconds (float): How long the audio took to synthesize, used by cache eviction.
+
+        Returns:
+        (nothing)
+        """
+
+        plugin = self._oracle_tts_livekit_plugin
+        audio_cache = plugin._audio_cache
+
+        #
+        #  bail out before any task or argument allocation when the write cannot apply.
+        #
+        if audio_bytes is None or audio_cache is None or \
+            len(self._input_text) > plugin._audio_cache_maximum_text_length:
+            return
+
+        #
+        #  silence padding around the utterance is dropped before it hits the disk; for a
+        #  chunk list the trim is applied to the first and last chunks, which is where the
+        #  padding lives.
+        #
+        if numpy is not None:
+            if isinstance(audio_bytes, (list, tuple)):
+                audio_bytes = list(audio_bytes)
+                audio_bytes[0] = trim_silence(audio_bytes[0], trailing = False)
+                audio_bytes[-1] = trim_silence(audio_bytes[-1], leading = False)
+            else:
+                audio_bytes = trim_silence(audio_bytes)
+
+        self._cache_write_task = asyncio.create_task(asyncio.to_thread(
+            audio_cache.set_by_key,
+            self._cache_key,
+            audio_bytes = audio_bytes,
+            synthesis_milliseconds = synthesis_milliseconds))
+
+
+class DerivedTTSChunkedStreamNoCache(DerivedTTSChunkedStream):
+    """
+    The TTS chunked stream class for plug-ins without an audio cache: every utterance streams
+    straight from the synthesizer to the emitter.
+    """
+
+    async def _run(self) -> None:
+        await self.stream_synthesis_and_emit()
+
+
+class DerivedTTSChunkedStreamCached(DerivedTTSChunkedStream):
+    """
+    The TTS chunked stream class for plug-ins with an audio cache: the hot layer and the disk
+    cache are consulted (optionally racing the remote synthesis) before synthesizing.
+    """
+
+    async def _run(self) -> None:
+        #
+        #  hoisted locals: these are read several times below, and a local is one fast load
+        #  where the attribute chain is a dictionary lookup per dot on every use.
+        #
+        plugin = self._oracle_tts_livekit_plugin
+        audio_cache = plugin._audio_cache
+        text = self._input_text
+
+        #
+        #  the cache key is hashed once here and reused for the hot cache, the disk lookup,
+        #  and the eventual write, instead of re-encoding the text for each step.
+        #
+        self._cache_key = AudioCache.form_key(
+            text = text,
+            voice = plugin._voice,
+            audio_rate = REQUIRED_LIVE_KIT_AUDIO_RATE,
+            audio_channels = REQUIRED_LIVE_KIT_AUDIO_CHANNELS,
+            audio_bits = REQUIRED_LIVE_KIT_AUDIO_BITS
+            )
+
+        audio_bytes = plugin._hot.get(self._cache_key)
+
+        if audio_bytes is not None:
+            plugin._hot.move_to_end(self._cache_key)
+
+        elif plugin._cache_race_deadline_ms is not None:
+            #
+            #  speculative race: issue the cache lookup and the remote synthesis concurrently.
+            #  if the cache answers within the deadline the synthesis is cancelled; otherwise
+            #  the synthesis result is used, bounding worst-case latency at the cost of a
+            #  little wasted remote work.
+            #
+            cache_task = asyncio.create_task(asyncio.to_thread(audio_cache.get_by_key, self._cache_key))
+
+            synthesis_task = asyncio.create_task(plugin._oracle_tts.synthesize_speech(text = text))
+
+            await asyncio.wait({cache_task}, timeout = plugin._cache_race_deadline_ms / 1000.0)
+
+            if cache_task.done():
+                audio_bytes = cache_task.result()
+                if audio_bytes is not None:
+                    plugin.set_hot(self._cache_key, audio_bytes)
+            else:
+                #
+                #  cancelling does not stop a to_thread call that already started; if the
+                #  lookup still completes with a pooled buffer, hand it back to the pool
+                #  rather than letting it age out unrecycled.
+                #
+                cache_task.cancel()
+                cache_task.add_done_callback(DerivedTTSChunkedStream.release_late_cache_result)
+
+            if audio_bytes is not None:
+                synthesis_task.cancel()
+            else:
+                synthesis_start = time.monotonic()
+                audio_bytes = await synthesis_task
+                self.schedule_cache_write(audio_bytes, synthesis_milliseconds = (time.monotonic() - synthesis_start) * 1000.0)
+        else:
+            #
+            #  the cache hits disk and SQLite, so both the lookup and the write run on a worker
+            #  thread rather than stalling the event loop (and with it the audio pipeline).
+            #
+            audio_bytes = await asyncio.to_thread(audio_cache.get_by_key, self._cache_key)
+
+            if audio_bytes is not None:
+                plugin.set_hot(self._cache_key, audio_bytes)
+            else:
+                #
+                #  cache miss: stream the synthesis, emitting audio as it arrives instead of
+                #  waiting for the complete buffer. the cached-hit path below stays
+                #  non-streaming since the bytes are already local.
+                #
+                await self.stream_synthesis_and_emit()
+                return
+
+        if audio_bytes is not None:
+            self.emit_audio_bytes(audio_bytes)
@@ -0,0 +1,63 @@
+"""
+This module provides a process-wide cache of OCI authentication configurations and signers.
+It is shared by the Oracle STT, LLM, and TTS wrappers so that the security token read and the
+PEM private-key parse happen once per configuration rather than once per plug-in instance.
+
+Author: Keith Schnable (at Oracle Corporation)
+Date: 2026-09-01
+"""
+
+import os
+
+import functools
+
+import oci
+from oci.config import from_file
+from oci.auth.signers.security_token_signer import SecurityTokenSigner
+
+
+def get_configuration_and_signer(authentication_configuration_file_spec: str, authentication_configuration_name: str):
+    """
+    Get the configuration and signer for the specified authentication configuration file and name.
+
+    Parameters:
+    authentication_configuration_file_spec (str): The authentication configuration file ("~/.oci/config" for example).
+    authentication_configuration_name (str): The authentication configuration name ("DEFAULT" for example).
+
+    Returns:
+    tuple: The configuration and the signer.
+    """
+
+    configuration_modification_time = os.stat(os.path.expanduser(authentication_configuration_file_spec)).st_mtime
+
+    config = _get_configuration(authentication_configuration_file_spec, authentication_configuration_name, configuration_modification_time)
+
+    #
+    #  session token rotation rewrites the token file (and the key file) without touching the
+    #  configuration file, so the signer is cached on those files' modification times; a
+    #  refreshed token is picked up on the next call without restarting the process.
+    #
+    token_file_spec = config["security_token_file"]
+    key_file_spec = config["key_file"]
+
+    signer = _get_signer(
+        token_file_spec,
+        key_file_spec,
+        os.stat(token_file_spec).st_mtime,
+        os.stat(key_file_spec).st_mtime
+        )
+
+    return config, signer
+
+
+@functools.lru_cache(maxsize = 8)
+def _get_configuration(authentication_configuration_file_spec, authentication_configuration_name, modification_time):
+    return from_file(authentication_configuration_file_spec, authentication_configuration_name)
+
+
+@functools.lru_cache(maxsize = 8)
+def _get_signer(token_file_spec, key_file_spec, token_modification_time, key_modification_time):
+    with open(token_file_spec, "r") as f:
+        token = f.readline()
+    private_key = oci.signer.load_private_key_from_file(key_file_spec)
+    return SecurityTokenSigner(token = token, private_key = private_key)
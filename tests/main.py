@@ -138,7 +138,8 @@ async def entrypoint(ctx: agents.JobContext):
             #
             voice = "Victoria",
             audio_cache_file_path = "/Users/kschnabl/temp/livekit_tts_plugin_cache",
-            audio_cache_maximum_text_length = 100
+            audio_cache_maximum_text_length = 100,
+            prewarm_phrases = ["How can I help you?"]
             ),
 
 